@@ -1 +1,78 @@
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, Final, Tuple
+
 from .__version__ import __author__, __copyright__, __email__, __license__, __version__
+
+
+if TYPE_CHECKING:
+    from ._client import CachedGaroonClient, ClientProtocol, GaroonClient
+    from ._event import Event, Facility, Organization, User
+    from ._ics import IcsRenderer, render_vevent, write_ics
+    from ._query import find_next_event, iter_events, iter_organizations, iter_users, query_profiles
+    from ._snapshot import SnapshotClient, SnapshotError, SnapshotWriter
+
+    Client = GaroonClient
+
+
+# attribute name -> (module name, attribute name of the module).
+# modules are imported on the first access to keep the command launcher lightweight.
+_LAZY_ATTRS: Final[Dict[str, Tuple[str, str]]] = {
+    "CachedGaroonClient": ("._client", "CachedGaroonClient"),
+    "Client": ("._client", "GaroonClient"),
+    "ClientProtocol": ("._client", "ClientProtocol"),
+    "Event": ("._event", "Event"),
+    "Facility": ("._event", "Facility"),
+    "GaroonClient": ("._client", "GaroonClient"),
+    "IcsRenderer": ("._ics", "IcsRenderer"),
+    "Organization": ("._event", "Organization"),
+    "SnapshotClient": ("._snapshot", "SnapshotClient"),
+    "SnapshotError": ("._snapshot", "SnapshotError"),
+    "SnapshotWriter": ("._snapshot", "SnapshotWriter"),
+    "User": ("._event", "User"),
+    "find_next_event": ("._query", "find_next_event"),
+    "iter_events": ("._query", "iter_events"),
+    "iter_organizations": ("._query", "iter_organizations"),
+    "iter_users": ("._query", "iter_users"),
+    "query_profiles": ("._query", "query_profiles"),
+    "render_vevent": ("._ics", "render_vevent"),
+    "write_ics": ("._ics", "write_ics"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), attr_name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> Tuple[str, ...]:
+    return tuple(globals()) + __all__
+
+
+__all__ = (
+    "CachedGaroonClient",
+    "Client",
+    "ClientProtocol",
+    "Event",
+    "Facility",
+    "GaroonClient",
+    "IcsRenderer",
+    "Organization",
+    "SnapshotClient",
+    "SnapshotError",
+    "SnapshotWriter",
+    "User",
+    "find_next_event",
+    "iter_events",
+    "iter_organizations",
+    "iter_users",
+    "query_profiles",
+    "render_vevent",
+    "write_ics",
+)
@@ -1,9 +1,12 @@
 import errno
+import io
+import os
 import sys
-from datetime import datetime
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime, timedelta
 from enum import Enum, unique
 from textwrap import dedent
-from typing import Final, List, Optional, Tuple
+from typing import Any, Callable, Dict, Final, List, Optional, Tuple, Type
 
 import click
 import pytablewriter as ptw
@@ -11,12 +14,18 @@ from dateutil import tz
 from dateutil.parser import parse
 from requests.exceptions import HTTPError, TooManyRedirects
 
+from . import _daemon
 from .__version__ import __version__
-from ._client import GaroonClient
-from ._config import ConfigKey, app_config_mgr
+from ._client import CachedGaroonClient, ClientProtocol, GaroonClient
+from ._config import DEFAULT_PROFILE, ConfigKey, extract_limits, list_profiles, make_config_manager
 from ._const import MODULE_NAME
-from ._filter import col_separator_style_filter, style_filter
+from ._event import Event
+from ._filter import make_event_row_style
+from ._ics import IcsRenderer
 from ._logger import LogLevel, initialize_logger, logger  # type: ignore
+from ._query import find_next_event, iter_events, iter_organizations, iter_users, query_profiles
+from ._snapshot import SnapshotClient, SnapshotError, SnapshotWriter, get_default_snapshot_path
+from ._table import TableFormat, altrow_style, write_table
 
 
 COMMAND_EPILOG: Final[str] = dedent(
@@ -24,14 +33,23 @@ COMMAND_EPILOG: Final[str] = dedent(
     Issue tracker: https://github.com/thombashi/grsched/issues
     """
 )
-CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"], show_default=True, obj={})
+CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"], show_default=True)
 
 
 @unique
 class Context(Enum):
     LOG_LEVEL = 0
     VERBOSITY_LEVEL = 1
-    CONFIGS = 2
+    PROFILES = 2
+    CLIENT_FACTORY = 3
+    IN_DAEMON = 4
+
+
+STATS_REPORTS: Final[Tuple[str, ...]] = ("users", "slots", "facilities", "attendees")
+FETCH_ERRORS: Final[Tuple[Type[Exception], ...]] = (HTTPError, TooManyRedirects, SnapshotError)
+
+# (profile name) -> client connected to the tenant of the profile
+ClientFactory = Callable[[str], ClientProtocol]
 
 
 def _extract_targets(
@@ -50,6 +68,65 @@ def _extract_targets(
     return (target, target_type)
 
 
+def _make_client_kwargs(profile: str) -> Dict[str, Any]:
+    try:
+        app_configs = make_config_manager(profile).load()
+    except ValueError as e:
+        logger.debug(e)
+        app_configs = {}
+
+    return dict(
+        subdomain=app_configs.get(ConfigKey.SUBDOMAIN),
+        basic_auth=app_configs.get(ConfigKey.BASIC_AUTH),
+        limits=extract_limits(app_configs),
+    )
+
+
+def _make_garoon_client(profile: str) -> GaroonClient:
+    return GaroonClient(**_make_client_kwargs(profile))
+
+
+def _get_default_snapshot_path(profile: str) -> str:
+    return get_default_snapshot_path(None if profile == DEFAULT_PROFILE else profile)
+
+
+def _get_profile(ctx: click.Context) -> str:
+    profiles = ctx.obj[Context.PROFILES]
+    if len(profiles) > 1:
+        logger.error(f"the command does not support multiple profiles: {', '.join(profiles)}")
+        sys.exit(errno.EINVAL)
+
+    return profiles[0]
+
+
+def _make_clients(ctx: click.Context) -> Dict[str, ClientProtocol]:
+    factory: ClientFactory = ctx.obj.get(Context.CLIENT_FACTORY, _make_garoon_client)
+    clients: Dict[str, ClientProtocol] = {}
+
+    for profile in ctx.obj[Context.PROFILES]:
+        try:
+            clients[profile] = factory(profile)
+        except ValueError as e:
+            profile_option = "" if profile == DEFAULT_PROFILE else f"--profile {profile} "
+            logger.error(f"{e}. try '{MODULE_NAME} {profile_option}configure' first.")
+            sys.exit(1)
+
+    return clients
+
+
+def _make_client(ctx: click.Context) -> ClientProtocol:
+    profile = _get_profile(ctx)
+
+    return _make_clients(ctx)[profile]
+
+
+def _get_start_timestamp(event: Event) -> float:
+    if event.dtr is None or event.dtr.start_datetime is None:
+        return float("inf")
+
+    return event.dtr.start_datetime.timestamp()
+
+
 @click.group(context_settings=CONTEXT_SETTINGS)
 @click.version_option(version=__version__, message="%(prog)s %(version)s")
 @click.option("--debug", "log_level", flag_value=LogLevel.DEBUG, help="For debug print.")
@@ -61,24 +138,112 @@ def _extract_targets(
     help="Suppress execution log messages.",
 )
 @click.option("-v", "--verbose", "verbosity_level", count=True)
+@click.option(
+    "--daemon-socket",
+    metavar="PATH",
+    envvar="GRSCHED_DAEMON_SOCKET",
+    help=(
+        "execute commands via a daemon that listening on the Unix domain socket. "
+        "fallback to local execution if the daemon is not running."
+    ),
+)
+@click.option(
+    "--snapshot",
+    "snapshot_path",
+    metavar="PATH",
+    help="answer queries from the snapshot file instead of the server.",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="answer queries from the default snapshot file. see 'snapshot save -h'.",
+)
+@click.option(
+    "--profile",
+    metavar="NAME",
+    envvar="GRSCHED_PROFILE",
+    default=DEFAULT_PROFILE,
+    help="name of the profile (tenant configurations) to use.",
+)
+@click.option(
+    "--all-profiles",
+    is_flag=True,
+    help="query all of the configured profiles concurrently and merge the results.",
+)
 @click.pass_context
-def cmd(ctx: click.Context, log_level: str, verbosity_level: int) -> None:
+def cmd(
+    ctx: click.Context,
+    log_level: str,
+    verbosity_level: int,
+    daemon_socket: Optional[str],
+    snapshot_path: Optional[str],
+    offline: bool,
+    profile: str,
+    all_profiles: bool,
+) -> None:
     """
     common cmd help
     """
 
+    # command lines are forwarded to a daemon by the command launcher (see _launcher.py)
+    # before the invocation of the command
+
+    # create the context object per invocation: an object that is shared between invocations
+    # would keep the clients of a previous invocation (e.g. snapshot clients)
+    ctx.ensure_object(dict)
+
     ctx.obj[Context.LOG_LEVEL] = LogLevel.INFO if log_level is None else log_level
     ctx.obj[Context.VERBOSITY_LEVEL] = verbosity_level
 
     initialize_logger(name=f"{MODULE_NAME:s}", log_level=ctx.obj[Context.LOG_LEVEL])
 
-    try:
-        app_configs = app_config_mgr.load()
-    except ValueError as e:
-        logger.debug(e)
-        app_configs = {}
+    # a daemon also rejects the commands since clients other than the launcher may send them
+    if (
+        ctx.obj.get(Context.IN_DAEMON)
+        and ctx.invoked_subcommand in _daemon.NON_FORWARDABLE_COMMANDS
+    ):
+        logger.error(f"'{ctx.invoked_subcommand}' command cannot be executed by the daemon")
+        sys.exit(errno.EPERM)
+
+    if all_profiles:
+        profiles = list_profiles()
+        if not profiles:
+            logger.error(f"no profiles configured. try '{MODULE_NAME} configure' first.")
+            sys.exit(errno.ENOENT)
+    else:
+        try:
+            make_config_manager(profile)
+        except ValueError as e:
+            logger.error(e)
+            sys.exit(errno.EINVAL)
 
-    ctx.obj[Context.CONFIGS] = app_configs
+        profiles = [profile]
+
+    ctx.obj[Context.PROFILES] = profiles
+
+    if (snapshot_path or offline) and ctx.invoked_subcommand != "snapshot":
+        if snapshot_path and len(profiles) > 1:
+            logger.error("--snapshot option cannot be used with --all-profiles option")
+            sys.exit(errno.EINVAL)
+
+        snapshot_clients: Dict[str, SnapshotClient] = {}
+
+        def close_snapshot_clients() -> None:
+            for snapshot_client in snapshot_clients.values():
+                snapshot_client.close()
+
+        ctx.call_on_close(close_snapshot_clients)
+
+        try:
+            for profile in profiles:
+                snapshot_clients[profile] = SnapshotClient(
+                    snapshot_path or _get_default_snapshot_path(profile)
+                )
+        except SnapshotError as e:
+            logger.error(e)
+            sys.exit(errno.ENOENT)
+
+        ctx.obj[Context.CLIENT_FACTORY] = snapshot_clients.__getitem__
 
 
 @cmd.command(epilog=COMMAND_EPILOG)
@@ -98,11 +263,91 @@ def version(ctx: click.Context) -> None:
 def configure(ctx: click.Context) -> None:
     """
     Setup configurations of the tool.
+    Use the --profile option to setup configurations of another tenant.
+    """
+
+    config_mgr = make_config_manager(_get_profile(ctx))
+    logger.debug(f"{MODULE_NAME} configuration file existence: {config_mgr.exists}")
+
+    sys.exit(config_mgr.configure())
+
+
+@cmd.command(epilog=COMMAND_EPILOG)
+@click.pass_context
+@click.option(
+    "--socket",
+    "socket_path",
+    metavar="PATH",
+    default=_daemon.get_default_socket_path(),
+    help="path to the Unix domain socket to listen.",
+)
+@click.option(
+    "--ttl",
+    type=float,
+    default=60,
+    help="seconds to keep fetched results in memory.",
+)
+def daemon(ctx: click.Context, socket_path: str, ttl: float) -> None:
     """
+    Start a daemon that serves commands over a Unix domain socket.
+    The daemon keeps a warm client and caches of fetched results in memory.
+    Use the --daemon-socket option (or GRSCHED_DAEMON_SOCKET environment variable)
+    to execute commands via the daemon.
+    Each profile has its own client and caches.
+    """
+
+    if not _daemon.is_available():
+        logger.error("the daemon requires Unix domain sockets, which are not available")
+        sys.exit(errno.ENOTSUP)
+
+    clients: Dict[str, CachedGaroonClient] = {}
+
+    def client_factory(profile: str) -> ClientProtocol:
+        if profile not in clients:
+            clients[profile] = CachedGaroonClient(ttl=ttl, **_make_client_kwargs(profile))
+
+        return clients[profile]
+
+    # verify configurations and warm up clients of the profiles before serving
+    ctx.obj[Context.CLIENT_FACTORY] = client_factory
+    _make_clients(ctx)
+    log_level = ctx.obj[Context.LOG_LEVEL]
+
+    def handler(args: List[str]) -> Tuple[int, str, str]:
+        stdout = io.StringIO()
+        stderr = io.StringIO()
 
-    logger.debug(f"{MODULE_NAME} configuration file existence: {app_config_mgr.exists}")
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                exit_code = cmd.main(
+                    args=args,
+                    prog_name=MODULE_NAME,
+                    standalone_mode=False,
+                    obj={Context.CLIENT_FACTORY: client_factory, Context.IN_DAEMON: True},
+                )
+            except click.ClickException as e:
+                e.show()
+                exit_code = e.exit_code
+            except SystemExit as e:
+                exit_code = e.code
+            except Exception as e:
+                logger.exception(e)
+                exit_code = 1
+
+        # executed commands re-initialize the logger with their own options
+        initialize_logger(name=f"{MODULE_NAME:s}", log_level=log_level)
+
+        return (
+            exit_code if isinstance(exit_code, int) else 0,
+            stdout.getvalue(),
+            stderr.getvalue(),
+        )
 
-    sys.exit(app_config_mgr.configure())
+    try:
+        _daemon.serve(socket_path, handler)
+    except OSError as e:
+        logger.error(e)
+        sys.exit(errno.EADDRINUSE)
 
 
 @cmd.command(epilog=COMMAND_EPILOG)
@@ -119,10 +364,7 @@ def show(ctx: click.Context, event_ids: List[str], user: Optional[str]) -> None:
     """
 
     verbosity_level = ctx.obj[Context.VERBOSITY_LEVEL]
-    app_configs = ctx.obj[Context.CONFIGS]
-    client = GaroonClient(
-        subdomain=app_configs[ConfigKey.SUBDOMAIN], basic_auth=app_configs[ConfigKey.BASIC_AUTH]
-    )
+    client = _make_client(ctx)
     target, target_type = _extract_targets(user)
     now = datetime.now(tz=tz.tzlocal())
     now = now.replace(minute=0, second=0, microsecond=0)
@@ -132,37 +374,23 @@ def show(ctx: click.Context, event_ids: List[str], user: Optional[str]) -> None:
 
         if event_id == "next":
             try:
-                events, _has_next = client.fetch_events(
-                    start=now, days=14, target=target, target_type=target_type
+                next_event = find_next_event(
+                    client, now=now, days=14, target=target, target_type=target_type
                 )
-            except (HTTPError, TooManyRedirects) as e:
+            except FETCH_ERRORS as e:
                 logger.error(e)
                 sys.exit(errno.EACCES)
 
-            for event in events:
-                if event.is_all_day:
-                    continue
-
-                if event.dtr is None:
-                    logger.debug(f"event.dtr is None: {event}")
-                    continue
-
-                if event.dtr.start_datetime is None:
-                    logger.warning(f"start_datetime of a event ({event}) is None")
-                    continue
-
-                if now < event.dtr.start_datetime:
-                    print(event.as_markdown())
-                    break
-            else:
+            if next_event is None:
                 logger.error("event not found")
                 sys.exit(errno.ENOENT)
 
+            print(next_event.as_markdown())
             continue
 
         try:
             event = client.fetch_event(int(event_id))
-        except (HTTPError, TooManyRedirects) as e:
+        except FETCH_ERRORS as e:
             logger.error(e)
             sys.exit(errno.EACCES)
 
@@ -189,11 +417,8 @@ def events(
     """
 
     verbosity_level = ctx.obj[Context.VERBOSITY_LEVEL]
-    app_configs = ctx.obj[Context.CONFIGS]
     target, target_type = _extract_targets(user, organization)
-    client = GaroonClient(
-        subdomain=app_configs[ConfigKey.SUBDOMAIN], basic_auth=app_configs[ConfigKey.BASIC_AUTH]
-    )
+    clients = _make_clients(ctx)
 
     if since_str is None:
         since = datetime.now()
@@ -202,104 +427,369 @@ def events(
     since = since.replace(hour=0, minute=0, second=0, microsecond=0).astimezone(tz.tzlocal())
 
     try:
-        events, _has_next = client.fetch_events(
-            start=since, days=days, target=target, target_type=target_type
+        results = query_profiles(
+            clients,
+            lambda client: iter_events(
+                client, start=since, days=days, target=target, target_type=target_type
+            ),
         )
-    except (HTTPError, TooManyRedirects) as e:
+    except FETCH_ERRORS as e:
         logger.error(e)
         sys.exit(errno.EACCES)
 
-    if not events:
+    profile_events = [(profile, event) for profile, events in results.items() for event in events]
+    if not profile_events:
         logger.info("event not found")
         sys.exit(0)
 
-    matrix = []
-    for event in events:
-        matrix.append(event.as_row(event.is_all_day))
+    if len(clients) > 1:
+        # merge events of the profiles in the order of the start datetime
+        profile_events.sort(key=lambda item: _get_start_timestamp(item[1]))
 
-    writer = ptw.TableWriterFactory().create_from_format_name(
-        "markdown",
-        headers=["id", "Date and time", "Subject"],
-        value_matrix=matrix,
+    events = [event for _profile, event in profile_events]
+    headers = ["id", "Date and time", "Subject"]
+    rows: List[Tuple[Any, ...]] = [event.as_row(event.is_all_day) for event in events]
+
+    if len(clients) > 1:
+        headers = ["Profile"] + headers
+        rows = [(profile,) + row for (profile, _event), row in zip(profile_events, rows)]
+
+    write_table(
+        headers=headers,
+        rows=rows,
         margin=1,
-        style_filter_kwargs={
-            "now": datetime.now(events[0].timezone),
-            "dtrs": list(map(list, zip(*matrix)))[1],
-        },
+        row_style=make_event_row_style(
+            [event.dtr for event in events], now=datetime.now(events[0].timezone)
+        ),
     )
-    writer.add_style_filter(style_filter)
-    writer.add_col_separator_style_filter(col_separator_style_filter)
 
-    writer.write_table()
+
+@cmd.command(epilog=COMMAND_EPILOG)
+@click.pass_context
+@click.option(
+    "--user", metavar="USER_ID", help="user id of the target. defaults to the login user."
+)
+@click.option("--organization", metavar="ORGANIZATION_ID", help="organization id of the target.")
+@click.option("--since", "since_str", metavar="DATETIME", help="datetime.")
+@click.option("--days", type=int, default=28, help="number of days to aggregate.")
+@click.option(
+    "--report",
+    "reports",
+    type=click.Choice(STATS_REPORTS),
+    multiple=True,
+    help="reports to output. defaults to all of the reports.",
+)
+def stats(
+    ctx: click.Context,
+    user: Optional[str],
+    organization: Optional[str],
+    since_str: Optional[str],
+    days: int,
+    reports: Tuple[str, ...],
+) -> None:
+    """
+    Show statistics of events:
+    weekly meeting hours per user, busiest time slots, facility utilization,
+    and the number of attendees per event.
+    """
+
+    try:
+        from . import _stats
+    except ImportError as e:
+        logger.error(f"{e}. the command requires 'stats' extras: pip install {MODULE_NAME}[stats]")
+        sys.exit(errno.ENOENT)
+
+    target, target_type = _extract_targets(user, organization)
+    client = _make_client(ctx)
+
+    if since_str is None:
+        since = datetime.now()
+    else:
+        since = parse(since_str)
+    since = since.replace(hour=0, minute=0, second=0, microsecond=0).astimezone(tz.tzlocal())
+
+    try:
+        events = list(
+            iter_events(client, start=since, days=days, target=target, target_type=target_type)
+        )
+    except FETCH_ERRORS as e:
+        logger.error(e)
+        sys.exit(errno.EACCES)
+
+    logger.debug(f"fetched {len(events)} events")
+
+    frames = _stats.to_frames(events)
+    if frames.events.empty:
+        logger.info("event not found")
+        sys.exit(0)
+
+    timezone = tz.tzlocal()
+    tables = {
+        "users": (
+            "Weekly meeting hours",
+            lambda: _stats.calc_weekly_meeting_hours(frames, timezone),
+        ),
+        "slots": ("Busiest time slots", lambda: _stats.calc_busy_slots(frames, timezone)),
+        "facilities": (
+            "Facility utilization",
+            lambda: _stats.calc_facility_utilization(frames, period_hours=days * 24),
+        ),
+        "attendees": (
+            "Attendees per event",
+            lambda: _stats.calc_attendee_counts(frames, bins=[0, 1, 2, 3, 5, 10, 20]),
+        ),
+    }
+
+    for report in reports if reports else STATS_REPORTS:
+        table_name, calc = tables[report]
+        writer = ptw.TableWriterFactory().create_from_format_name("markdown", margin=1)
+        writer.from_dataframe(calc())
+        writer.table_name = table_name
+        writer.write_table()
+        print()
 
 
 @cmd.command(epilog=COMMAND_EPILOG)
 @click.pass_context
-def users(ctx: click.Context) -> None:
+@click.option(
+    "--user", metavar="USER_ID", help="user id of the target. defaults to the login user."
+)
+@click.option("--organization", metavar="ORGANIZATION_ID", help="organization id of the target.")
+@click.option("--since", "since_str", metavar="DATETIME", help="datetime.")
+@click.option("--days", type=int, default=28, help="number of days to output events.")
+@click.option(
+    "-o",
+    "--output",
+    "output_path",
+    metavar="PATH",
+    help="path to the output file. defaults to the standard output.",
+)
+@click.option(
+    "--cache",
+    "cache_path",
+    metavar="PATH",
+    help="path to a file to keep rendered events. only changed events are re-rendered.",
+)
+@click.option("--name", "calendar_name", default="", help="name of the calendar.")
+def ics(
+    ctx: click.Context,
+    user: Optional[str],
+    organization: Optional[str],
+    since_str: Optional[str],
+    days: int,
+    output_path: Optional[str],
+    cache_path: Optional[str],
+    calendar_name: str,
+) -> None:
     """
-    List users.
+    Output events as an iCalendar (RFC 5545) feed.
     """
 
-    verbosity_level = ctx.obj[Context.VERBOSITY_LEVEL]
-    app_configs = ctx.obj[Context.CONFIGS]
-    client = GaroonClient(
-        subdomain=app_configs[ConfigKey.SUBDOMAIN], basic_auth=app_configs[ConfigKey.BASIC_AUTH]
-    )
-    matrix = []
-    has_next = True
-    offset = 0
+    target, target_type = _extract_targets(user, organization)
+    client = _make_client(ctx)
+    renderer = IcsRenderer(calendar_name=calendar_name)
+
+    if cache_path:
+        renderer.load_cache(cache_path)
+
+    if since_str is None:
+        since = datetime.now()
+    else:
+        since = parse(since_str)
+    since = since.replace(hour=0, minute=0, second=0, microsecond=0).astimezone(tz.tzlocal())
+
+    events = iter_events(client, start=since, days=days, target=target, target_type=target_type)
+
+    try:
+        if output_path:
+            tmp_path = f"{output_path}.tmp"
+            with open(tmp_path, "w", encoding="utf8", newline="") as f:
+                renderer.write(events, f)
+            os.replace(tmp_path, output_path)
+        else:
+            renderer.write(events, sys.stdout)
+    except FETCH_ERRORS as e:
+        logger.error(e)
+        sys.exit(errno.EACCES)
+    except OSError as e:
+        logger.error(e)
+        sys.exit(errno.EIO)
 
-    while has_next:
+    logger.debug(f"rendered={renderer.rendered_count}, reused={renderer.reused_count}")
+
+    if cache_path:
         try:
-            users, has_next = client.fetch_users(offset=offset)
-        except (HTTPError, TooManyRedirects) as e:
-            logger.error(e)
-            sys.exit(errno.EACCES)
+            renderer.dump_cache(cache_path)
+        except OSError as e:
+            logger.warning(f"failed to write the cache: {e}")
+
+
+@cmd.group(epilog=COMMAND_EPILOG)
+def snapshot() -> None:
+    """
+    Manage snapshots for the offline mode (--offline/--snapshot options).
+    """
 
-        for user in users:
-            matrix.append([user.id, user.name, user.code])
 
-        offset += len(users)
+@snapshot.command("save", epilog=COMMAND_EPILOG)
+@click.pass_context
+@click.option(
+    "--user",
+    "user_ids",
+    metavar="USER_ID",
+    multiple=True,
+    help="user id of the target. defaults to the login user.",
+)
+@click.option(
+    "--organization",
+    "organization_ids",
+    metavar="ORGANIZATION_ID",
+    multiple=True,
+    help="organization id of the target.",
+)
+@click.option("--since", "since_str", metavar="DATETIME", help="datetime.")
+@click.option("--days", type=int, default=14, help="number of days to save events.")
+@click.option(
+    "-o",
+    "--output",
+    "output_path",
+    metavar="PATH",
+    help="path to the snapshot file to write. defaults to the snapshot file of the profile.",
+)
+def snapshot_save(
+    ctx: click.Context,
+    user_ids: Tuple[str, ...],
+    organization_ids: Tuple[str, ...],
+    since_str: Optional[str],
+    days: int,
+    output_path: Optional[str],
+) -> None:
+    """
+    Save events, users and organizations to a snapshot file.
+    """
+
+    client = _make_client(ctx)
+    if not output_path:
+        output_path = _get_default_snapshot_path(_get_profile(ctx))
+    writer = SnapshotWriter()
+
+    if since_str is None:
+        since = datetime.now()
+    else:
+        since = parse(since_str)
+    since = since.replace(hour=0, minute=0, second=0, microsecond=0).astimezone(tz.tzlocal())
+
+    targets: List[Tuple[Optional[str], Optional[str]]] = [
+        _extract_targets(user=user_id) for user_id in user_ids
+    ] + [_extract_targets(organization=org_id) for org_id in organization_ids]
+    if not targets:
+        targets.append((None, None))
+
+    try:
+        for target, target_type in targets:
+            records: List[Dict[str, Any]] = []
+            has_next = True
+
+            while has_next:
+                fetched_records, has_next = client.fetch_event_records(
+                    start=since,
+                    days=days,
+                    target=target,
+                    target_type=target_type,
+                    offset=len(records),
+                )
+                if not fetched_records:
+                    break
+
+                records.extend(fetched_records)
+
+            logger.debug(f"fetched {len(records)} events: target={target}")
+            writer.add_events(
+                records,
+                start=since,
+                end=since + timedelta(days=days),
+                target=target,
+                target_type=target_type,
+            )
 
-    writer = ptw.TableWriterFactory().create_from_format_name("space_aligned")
-    writer.headers = ["id", "name", "code"]
-    writer.value_matrix = matrix
-    writer.set_theme("altrow")
-    writer.write_table()
+        writer.add_users(list(iter_users(client)))
+        writer.add_organizations(list(iter_organizations(client)))
+    except FETCH_ERRORS as e:
+        logger.error(e)
+        sys.exit(errno.EACCES)
+
+    try:
+        writer.write(output_path)
+    except OSError as e:
+        logger.error(e)
+        sys.exit(errno.EIO)
+
+    logger.info(f"snapshot saved: {output_path}")
 
 
 @cmd.command(epilog=COMMAND_EPILOG)
 @click.pass_context
-def organizations(ctx: click.Context) -> None:
+def users(ctx: click.Context) -> None:
     """
-    List organizations.
+    List users.
     """
 
-    app_configs = ctx.obj[Context.CONFIGS]
-    client = GaroonClient(
-        subdomain=app_configs[ConfigKey.SUBDOMAIN], basic_auth=app_configs[ConfigKey.BASIC_AUTH]
+    verbosity_level = ctx.obj[Context.VERBOSITY_LEVEL]
+    clients = _make_clients(ctx)
+    try:
+        results = query_profiles(clients, iter_users)
+    except FETCH_ERRORS as e:
+        logger.error(e)
+        sys.exit(errno.EACCES)
+
+    headers = ["id", "name", "code"]
+    rows: List[Tuple[Any, ...]] = [
+        (user.id, user.name, user.code) for users in results.values() for user in users
+    ]
+
+    if len(clients) > 1:
+        headers = ["profile"] + headers
+        rows = [
+            (profile, user.id, user.name, user.code)
+            for profile, users in results.items()
+            for user in users
+        ]
+
+    write_table(
+        headers=headers,
+        rows=rows,
+        table_format=TableFormat.SPACE_ALIGNED,
+        row_style=altrow_style,
     )
-    matrix = []
-    has_next = True
-    offset = 0
 
-    while has_next:
-        try:
-            orgs, has_next = client.fetch_organizations(offset=offset)
-        except (HTTPError, TooManyRedirects) as e:
-            logger.error(e)
-            sys.exit(errno.EACCES)
 
-        for org in orgs:
-            matrix.append([org.id, org.name, org.code, org.parentOrganization])
+@cmd.command(epilog=COMMAND_EPILOG)
+@click.pass_context
+def organizations(ctx: click.Context) -> None:
+    """
+    List organizations.
+    """
 
-        offset += len(orgs)
+    clients = _make_clients(ctx)
+    try:
+        results = query_profiles(clients, iter_organizations)
+    except FETCH_ERRORS as e:
+        logger.error(e)
+        sys.exit(errno.EACCES)
 
-    writer = ptw.TableWriterFactory().create_from_format_name(
-        "markdown",
-        headers=["ID", "Name", "Code", "Parent Org"],
-        value_matrix=matrix,
-        theme="altrow",
-        margin=1
-    )
-    writer.write_table()
+    headers = ["ID", "Name", "Code", "Parent Org"]
+    rows: List[Tuple[Any, ...]] = [
+        (org.id, org.name, org.code, org.parentOrganization)
+        for orgs in results.values()
+        for org in orgs
+    ]
+
+    if len(clients) > 1:
+        headers = ["Profile"] + headers
+        rows = [
+            (profile, org.id, org.name, org.code, org.parentOrganization)
+            for profile, orgs in results.items()
+            for org in orgs
+        ]
+
+    write_table(headers=headers, rows=rows, margin=1, row_style=altrow_style)
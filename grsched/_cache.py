@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Final, Optional
+
+import pytz
+import typepy
+
+
+TIMEZONE_CACHE_SIZE: Final[int] = 64
+DATETIME_CACHE_SIZE: Final[int] = 8192
+
+
+@lru_cache(maxsize=TIMEZONE_CACHE_SIZE)
+def get_timezone(name: str) -> tzinfo:
+    return pytz.timezone(name)
+
+
+@lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def parse_datetime(value: str, timezone_name: str) -> datetime:
+    """
+    Parse a datetime string in the same manner as ``DateTimeRange`` does.
+
+    Raises:
+        ValueError:
+            If the value is invalid as a datetime.
+    """
+
+    try:
+        return typepy.type.DateTime(
+            value, strict_level=typepy.StrictLevel.MIN, timezone=get_timezone(timezone_name)
+        ).convert()
+    except typepy.TypeConversionError as e:
+        raise ValueError(e)
+
+
+@lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def _format_datetime(
+    wall_clock: datetime, utcoffset: Optional[timedelta], tzname: Optional[str], format: str
+) -> str:
+    value = wall_clock
+    if utcoffset is not None:
+        value = wall_clock.replace(
+            tzinfo=timezone(utcoffset, tzname) if tzname else timezone(utcoffset)
+        )
+
+    try:
+        return value.strftime(format)
+    except ValueError:
+        return "NaT"
+
+
+def format_datetime(value: Optional[datetime], format: str) -> str:
+    """
+    Format a datetime with caching.
+    Results are cached by the wall clock time and the timezone of the datetime,
+    since aware datetimes of the same instant are equal regardless of the timezones.
+    """
+
+    if value is None:
+        return "NaT"
+
+    return _format_datetime(value.replace(tzinfo=None), value.utcoffset(), value.tzname(), format)
+
+
+def clear() -> None:
+    get_timezone.cache_clear()
+    parse_datetime.cache_clear()
+    _format_datetime.cache_clear()
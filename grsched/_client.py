@@ -1,28 +1,124 @@
-import sys
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 import retryrequests
+from urllib3.util.request import ACCEPT_ENCODING
 
-from ._const import LIMIT, MODULE_NAME
+from ._const import LIMIT, Endpoint
 from ._event import Event, Organization, User
 from ._logger import logger  # type: ignore
 
 
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+
+T = TypeVar("T")
+
+EVENT_FIELDS: Final[List[str]] = [
+    "id",
+    "creator",
+    "createdAt",
+    "updater",
+    "updatedAt",
+    "eventType",
+    "eventMenu",
+    "subject",
+    "notes",
+    "visibilityType",
+    "isAllDay",
+    "isStartOnly",
+    "attendees",
+    "facilities",
+    "start",
+    "end",
+    "additionalItems",
+]
+
+
+class ClientProtocol(Protocol):
+    """
+    Interface of clients that query functions accept.
+    Implemented by :py:class:`GaroonClient` and :py:class:`SnapshotClient`.
+    """
+
+    def fetch_event(self, id: int) -> Event: ...
+
+    def fetch_events(
+        self,
+        start: Optional[datetime],
+        days: float,
+        target: Optional[str] = None,
+        target_type: Optional[str] = None,
+        offset: int = 0,
+    ) -> Tuple[List[Event], bool]: ...
+
+    def fetch_event_records(
+        self,
+        start: Optional[datetime],
+        days: float,
+        target: Optional[str] = None,
+        target_type: Optional[str] = None,
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], bool]: ...
+
+    def fetch_users(self, offset: int) -> Tuple[List[User], bool]: ...
+
+    def fetch_organizations(self, offset: int) -> Tuple[List[Organization], bool]: ...
+
+
 class GaroonClient:
-    def __init__(self, subdomain: str, basic_auth: str) -> None:
+    """
+    A client of Garoon REST API.
+    An instance holds a connection pool and can be reused across requests.
+
+    Args:
+        subdomain:
+            Subdomain of the cybozu.com tenant.
+        basic_auth:
+            Base64 encoded ``login-name:password``.
+        limits:
+            Number of items to fetch per request for each endpoint.
+
+    Raises:
+        ValueError:
+            If the ``subdomain`` is empty.
+    """
+
+    def __init__(
+        self, subdomain: str, basic_auth: str, limits: Optional[Mapping[str, int]] = None
+    ) -> None:
         if not subdomain:
-            logger.error(f"require a valid subdomain. try '{MODULE_NAME} configure' first.")
-            sys.exit(1)
+            raise ValueError("require a valid subdomain")
 
         self.__subdomain = "{}.cybozu.com".format(subdomain.strip().rstrip(".cybozu.com"))
         self.__basic_auth = basic_auth
+        self.__session = retryrequests.make_requests_session()
+        self.__limits: Dict[str, int] = dict(limits) if limits else {}
 
         logger.debug(f"subdomain: {self.__subdomain}")
 
     def fetch_event(self, id: int) -> Event:
-        response = retryrequests.get(
-            url=self.__make_url(endpoint="schedule/events", id=id),
+        response = self.__session.get(
+            url=self.__make_url(endpoint=Endpoint.EVENTS, id=id),
             headers=self.__make_headers(),
         )
         response.raise_for_status()
@@ -32,84 +128,129 @@ class GaroonClient:
     def fetch_events(
         self,
         start: Optional[datetime],
-        days: int,
+        days: float,
         target: Optional[str] = None,
         target_type: Optional[str] = None,
+        offset: int = 0,
     ) -> Tuple[List[Event], bool]:
-        params = self.__make_params(start=start, days=days)
-        if target:
-            params["target"] = target
-        if target_type:
-            params["targetType"] = target_type
-
-        response = retryrequests.get(
-            url=self.__make_url(endpoint="schedule/events"),
-            headers=self.__make_headers(),
-            params=params,
+        return self.__fetch_items(
+            Endpoint.EVENTS,
+            key="events",
+            params=self.__make_event_params(start, days, target, target_type, offset),
+            factory=Event,
         )
-        response.raise_for_status()
-        data = response.json()
 
-        return ([Event(**event) for event in data["events"]], data["hasNext"])
+    def fetch_event_records(
+        self,
+        start: Optional[datetime],
+        days: float,
+        target: Optional[str] = None,
+        target_type: Optional[str] = None,
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Same as ``fetch_events`` except for returning events as decoded JSON objects.
+        ``fields`` limits the fields of the events to fetch.
+        """
+
+        params = self.__make_event_params(start, days, target, target_type, offset)
+        if fields:
+            params["fields"] = ",".join(fields)
+
+        return self.__fetch_items(Endpoint.EVENTS, key="events", params=params, factory=dict)
 
     def fetch_users(
         self,
         offset: int,
     ) -> Tuple[List[User], bool]:
-        response = retryrequests.get(
-            url=self.__make_url(endpoint="base/users"),
-            headers=self.__make_headers(),
-            params={"limit": LIMIT, "offset": offset},
+        return self.__fetch_items(
+            Endpoint.USERS,
+            key="users",
+            params={"limit": self.__get_limit(Endpoint.USERS), "offset": offset},
+            factory=User,
         )
-        response.raise_for_status()
-        data = response.json()
-
-        return ([User(**user) for user in data["users"]], data["hasNext"])
 
     def fetch_organizations(
         self,
         offset: int,
     ) -> Tuple[List[Organization], bool]:
-        response = retryrequests.get(
-            url=self.__make_url(endpoint="base/organizations"),
-            headers=self.__make_headers(),
-            params={"limit": LIMIT, "offset": offset},
+        return self.__fetch_items(
+            Endpoint.ORGANIZATIONS,
+            key="organizations",
+            params={"limit": self.__get_limit(Endpoint.ORGANIZATIONS), "offset": offset},
+            factory=Organization,
         )
-        response.raise_for_status()
-        data = response.json()
 
-        return ([Organization(**org) for org in data["organizations"]], data["hasNext"])
+    def __fetch_items(
+        self, endpoint: str, key: str, params: Dict, factory: Callable[..., T]
+    ) -> Tuple[List[T], bool]:
+        with self.__session.get(
+            url=self.__make_url(endpoint=endpoint),
+            headers=self.__make_headers(),
+            params=params,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+
+            if ijson is None:
+                data = response.json()
+                return ([factory(**item) for item in data[key]], data["hasNext"])
+
+            # decode the body incrementally to create objects while receiving the response
+            response.raw.decode_content = True
+            item_prefix = f"{key}.item"
+            items: List[T] = []
+            has_next = False
+            builder: Optional[ObjectBuilder] = None
+
+            for prefix, event, value in ijson.parse(response.raw, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+
+                    if prefix == item_prefix and event == "end_map":
+                        items.append(factory(**builder.value))
+                        builder = None
+                elif prefix == item_prefix and event == "start_map":
+                    builder = ObjectBuilder()
+                    builder.event(event, value)
+                elif prefix == "hasNext" and event == "boolean":
+                    has_next = value
+
+        return (items, has_next)
+
+    def __get_limit(self, endpoint: str) -> int:
+        return self.__limits.get(endpoint, LIMIT)
 
     def __make_headers(self) -> Dict[str, str]:
         return {
             "Host": f"{self.__subdomain}:443",
             "X-Cybozu-Authorization": self.__basic_auth,
+            "Accept-Encoding": ACCEPT_ENCODING,
         }
 
-    def __make_params(self, start: Optional[datetime] = None, days: int = 7) -> Dict:
+    def __make_event_params(
+        self,
+        start: Optional[datetime],
+        days: float,
+        target: Optional[str],
+        target_type: Optional[str],
+        offset: int,
+    ) -> Dict:
+        params = self.__make_params(start=start, days=days)
+        if offset:
+            params["offset"] = offset
+        if target:
+            params["target"] = target
+        if target_type:
+            params["targetType"] = target_type
+
+        return params
+
+    def __make_params(self, start: Optional[datetime] = None, days: float = 7) -> Dict:
         params = {
-            "limit": LIMIT,
-            "fields": ",".join(
-                [
-                    "id",
-                    "creator",
-                    "createdAt",
-                    "updater",
-                    "updatedAt",
-                    "eventType",
-                    "eventMenu",
-                    "subject",
-                    "notes",
-                    "visibilityType",
-                    "isAllDay",
-                    "isStartOnly",
-                    "attendees",
-                    "facilities",
-                    "start",
-                    "end",
-                    "additionalItems",
-                ]
-            ),
+            "limit": self.__get_limit(Endpoint.EVENTS),
+            "fields": ",".join(EVENT_FIELDS),
             "orderBy": "start asc",
         }
 
@@ -125,3 +266,129 @@ class GaroonClient:
             url = f"{url}/{id}"
 
         return url
+
+
+class CachedGaroonClient(GaroonClient):
+    """
+    A client that keeps fetched results in memory for ``ttl`` seconds.
+    Intended to be used by long-running processes such as the daemon.
+    The cache is thread-safe, so the client can be used by parallel queries.
+    """
+
+    def __init__(
+        self,
+        subdomain: str,
+        basic_auth: str,
+        ttl: float,
+        limits: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        super().__init__(subdomain=subdomain, basic_auth=basic_auth, limits=limits)
+
+        self.__ttl = ttl
+        self.__cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self.__cache_lock = threading.Lock()
+
+    @property
+    def cache_size(self) -> int:
+        with self.__cache_lock:
+            return len(self.__cache)
+
+    def clear_cache(self) -> None:
+        with self.__cache_lock:
+            self.__cache.clear()
+
+    def fetch_event(self, id: int) -> Event:
+        return self.__get_or_fetch(
+            ("event", id), lambda: super(CachedGaroonClient, self).fetch_event(id)
+        )
+
+    def fetch_events(
+        self,
+        start: Optional[datetime],
+        days: float,
+        target: Optional[str] = None,
+        target_type: Optional[str] = None,
+        offset: int = 0,
+    ) -> Tuple[List[Event], bool]:
+        return self.__get_or_fetch(
+            ("events", start, days, target, target_type, offset),
+            lambda: super(CachedGaroonClient, self).fetch_events(
+                start=start, days=days, target=target, target_type=target_type, offset=offset
+            ),
+        )
+
+    def fetch_event_records(
+        self,
+        start: Optional[datetime],
+        days: float,
+        target: Optional[str] = None,
+        target_type: Optional[str] = None,
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        return self.__get_or_fetch(
+            (
+                "event_records",
+                start,
+                days,
+                target,
+                target_type,
+                offset,
+                tuple(fields) if fields else None,
+            ),
+            lambda: super(CachedGaroonClient, self).fetch_event_records(
+                start=start,
+                days=days,
+                target=target,
+                target_type=target_type,
+                offset=offset,
+                fields=fields,
+            ),
+        )
+
+    def fetch_users(self, offset: int) -> Tuple[List[User], bool]:
+        return self.__get_or_fetch(
+            ("users", offset), lambda: super(CachedGaroonClient, self).fetch_users(offset)
+        )
+
+    def fetch_organizations(self, offset: int) -> Tuple[List[Organization], bool]:
+        return self.__get_or_fetch(
+            ("organizations", offset),
+            lambda: super(CachedGaroonClient, self).fetch_organizations(offset),
+        )
+
+    def __get_or_fetch(self, key: Tuple, fetch: Any) -> Any:
+        now = time.monotonic()
+        with self.__cache_lock:
+            cached = self.__cache.get(key)
+        if cached is not None and now - cached[0] < self.__ttl:
+            logger.debug(f"cache hit: {key}")
+            return cached[1]
+
+        # do not hold the lock while fetching: other threads may fetch other pages in parallel
+        value = fetch()
+
+        with self.__cache_lock:
+            self.__purge_expired(now)
+
+            # re-insert to keep the entries in the order of fetched time
+            self.__cache.pop(key, None)
+            self.__cache[key] = (now, value)
+
+        return value
+
+    def __purge_expired(self, now: float) -> None:
+        # must be called with holding the lock of the cache
+        expired_keys = []
+
+        for key, (fetched_at, _value) in self.__cache.items():
+            if now - fetched_at < self.__ttl:
+                break
+
+            expired_keys.append(key)
+
+        for key in expired_keys:
+            del self.__cache[key]
+
+        if expired_keys:
+            logger.debug(f"purged {len(expired_keys)} expired cache entries")
@@ -1,28 +1,136 @@
-from typing import Final
+import glob
+import os
+import re
+from typing import Dict, Final, List, Mapping, Optional, Pattern, Union
 
 from appconfigpy import ConfigItem, ConfigManager, DefaultDisplayStyle
 
-from ._const import MODULE_NAME
+from ._const import LIMIT, MODULE_NAME, Endpoint
+from ._logger import logger  # type: ignore
 
 
 class ConfigKey:
     SUBDOMAIN: Final[str] = "subdomain"
     BASIC_AUTH: Final[str] = "basic_auth"
+    EVENTS_LIMIT: Final[str] = "events_limit"
+    USERS_LIMIT: Final[str] = "users_limit"
+    ORGANIZATIONS_LIMIT: Final[str] = "organizations_limit"
 
 
-app_config_mgr = ConfigManager(
-    MODULE_NAME,
-    [
-        ConfigItem(
-            name=ConfigKey.SUBDOMAIN,
-            prompt_text="subdomain",
-            initial_value="",
-        ),
-        ConfigItem(
-            name=ConfigKey.BASIC_AUTH,
-            prompt_text="basic auth info (base64 encoded 'login-name:passowrd')",
-            initial_value="",
-            default_display_style=DefaultDisplayStyle.PART_VISIBLE,
-        ),
-    ],
-)
+LIMIT_CONFIG_KEYS: Final[Dict[str, str]] = {
+    Endpoint.EVENTS: ConfigKey.EVENTS_LIMIT,
+    Endpoint.USERS: ConfigKey.USERS_LIMIT,
+    Endpoint.ORGANIZATIONS: ConfigKey.ORGANIZATIONS_LIMIT,
+}
+
+DEFAULT_PROFILE: Final[str] = "default"
+PROFILE_NAME_PATTERN: Final[Pattern] = re.compile(r"^[A-Za-z0-9_-]+$")
+
+CONFIG_ITEMS: Final[List[ConfigItem]] = [
+    ConfigItem(
+        name=ConfigKey.SUBDOMAIN,
+        prompt_text="subdomain",
+        initial_value="",
+    ),
+    ConfigItem(
+        name=ConfigKey.BASIC_AUTH,
+        prompt_text="basic auth info (base64 encoded 'login-name:passowrd')",
+        initial_value="",
+        default_display_style=DefaultDisplayStyle.PART_VISIBLE,
+    ),
+    ConfigItem(
+        name=ConfigKey.EVENTS_LIMIT,
+        prompt_text="number of events to fetch per request",
+        initial_value=LIMIT,
+        value_type=int,
+    ),
+    ConfigItem(
+        name=ConfigKey.USERS_LIMIT,
+        prompt_text="number of users to fetch per request",
+        initial_value=LIMIT,
+        value_type=int,
+    ),
+    ConfigItem(
+        name=ConfigKey.ORGANIZATIONS_LIMIT,
+        prompt_text="number of organizations to fetch per request",
+        initial_value=LIMIT,
+        value_type=int,
+    ),
+]
+
+
+def _to_config_name(profile: str) -> str:
+    if profile == DEFAULT_PROFILE:
+        return MODULE_NAME
+
+    return f"{MODULE_NAME}.{profile}"
+
+
+def make_config_manager(profile: str = DEFAULT_PROFILE) -> ConfigManager:
+    """
+    Make a configuration manager of a profile.
+    Configurations of the default profile are stored in ``~/.grsched``,
+    and the others are stored in ``~/.grsched.<profile>``.
+
+    Raises:
+        ValueError:
+            If the profile name is invalid.
+    """
+
+    if not PROFILE_NAME_PATTERN.search(profile):
+        raise ValueError(f"invalid profile name: '{profile}'")
+
+    if profile == DEFAULT_PROFILE:
+        return app_config_mgr
+
+    return ConfigManager(_to_config_name(profile), CONFIG_ITEMS)
+
+
+def _is_valid_config(path: str) -> bool:
+    if not os.path.isfile(path):
+        return False
+
+    try:
+        configs = app_config_mgr.load(path)
+    except (OSError, ValueError):
+        return False
+
+    return bool(configs.get(ConfigKey.SUBDOMAIN))
+
+
+def list_profiles() -> List[str]:
+    """
+    List names of the configured profiles.
+    ``~/.grsched.<profile>`` files that do not load as a configuration with a subdomain
+    (e.g. broken or empty files left by editors) are not regarded as profiles.
+    """
+
+    config_path = app_config_mgr.config_filepath
+    profiles = [DEFAULT_PROFILE] if _is_valid_config(config_path) else []
+    prefix = f"{config_path}."
+
+    for path in sorted(glob.glob(f"{glob.escape(prefix)}*")):
+        profile = path[len(prefix) :]
+        if not PROFILE_NAME_PATTERN.search(profile):
+            continue
+
+        if _is_valid_config(path):
+            profiles.append(profile)
+        else:
+            logger.debug(f"skip a file that is not a valid profile: {path}")
+
+    return profiles
+
+
+app_config_mgr = ConfigManager(_to_config_name(DEFAULT_PROFILE), CONFIG_ITEMS)
+
+
+def extract_limits(configs: Mapping[str, Union[int, float, str, None]]) -> Dict[str, int]:
+    limits: Dict[str, int] = {}
+
+    for endpoint, config_key in LIMIT_CONFIG_KEYS.items():
+        value: Optional[Union[int, float, str]] = configs.get(config_key)
+        if value:
+            limits[endpoint] = int(value)
+
+    return limits
@@ -3,3 +3,10 @@ from typing import Final
 
 MODULE_NAME: Final[str] = "grsched"
 LIMIT: Final[int] = 1000
+MAX_WORKERS: Final[int] = 4
+
+
+class Endpoint:
+    EVENTS: Final[str] = "schedule/events"
+    USERS: Final[str] = "base/users"
+    ORGANIZATIONS: Final[str] = "base/organizations"
@@ -0,0 +1,200 @@
+"""
+The module is imported by the command launcher before forwarding a command line to a daemon.
+Keep module level imports limited to the standard library.
+"""
+
+import errno
+import json
+import os
+import socket
+import socketserver
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Final, Iterator, List, Mapping, Optional, Tuple
+
+from ._const import MODULE_NAME
+
+
+ENCODING: Final[str] = "utf8"
+# commands that are executed only locally: interactive, long-running or process-specific ones
+NON_FORWARDABLE_COMMANDS: Final[Tuple[str, ...]] = ("configure", "daemon", "snapshot", "version")
+RECV_BUFSIZE: Final[int] = 64 * 1024
+
+# (args) -> (exit code, stdout, stderr)
+Handler = Callable[[List[str]], Tuple[int, str, str]]
+
+
+class DaemonUnavailableError(Exception):
+    """
+    Raised when failed to connect to a daemon.
+    The command line has not been sent to the daemon.
+    """
+
+
+def is_available() -> bool:
+    """
+    Returns:
+        |True| if Unix domain sockets are available on the platform (not available on Windows).
+    """
+
+    return hasattr(socket, "AF_UNIX")
+
+
+def get_default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, f"{MODULE_NAME}.sock")
+
+    return os.path.join(os.path.expanduser("~"), f".{MODULE_NAME}.sock")
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+
+    while True:
+        chunk = sock.recv(RECV_BUFSIZE)
+        if not chunk:
+            break
+
+        chunks.append(chunk)
+
+    return b"".join(chunks)
+
+
+def request(
+    socket_path: str,
+    args: List[str],
+    cwd: Optional[str] = None,
+    env: Optional[Mapping[str, str]] = None,
+    connect_timeout: float = 5.0,
+) -> Tuple[int, str, str]:
+    """
+    Send a command line to a running daemon and return the result of the execution.
+
+    Args:
+        socket_path:
+            Path to the Unix domain socket of the daemon.
+        args:
+            Command line arguments to execute.
+        cwd:
+            Working directory to execute the command line in.
+        env:
+            Environment variables to execute the command line with.
+        connect_timeout:
+            Timeout in seconds to connect to the daemon.
+            Waits for the result without timeout once connected,
+            since the execution of a command line may take a long time.
+
+    Raises:
+        DaemonUnavailableError:
+            If failed to connect to the daemon.
+        OSError:
+            If failed to communicate with the daemon after sending the command line.
+            The daemon may have executed the command line.
+    """
+
+    payload = {"args": args, "cwd": cwd, "env": dict(env) if env is not None else None}
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(connect_timeout)
+        try:
+            sock.connect(socket_path)
+        except OSError as e:
+            raise DaemonUnavailableError(e) from e
+
+        sock.settimeout(None)
+        sock.sendall(json.dumps(payload).encode(ENCODING))
+        sock.shutdown(socket.SHUT_WR)
+        data = _recv_all(sock)
+
+    try:
+        result: Dict = json.loads(data.decode(ENCODING))
+        return (int(result["exit_code"]), str(result["stdout"]), str(result["stderr"]))
+    except (ValueError, KeyError, TypeError) as e:
+        raise OSError(errno.EBADMSG, f"invalid response from the daemon: {e}", socket_path)
+
+
+@contextmanager
+def _switch_environment(cwd: Optional[str], env: Optional[Mapping[str, str]]) -> Iterator[None]:
+    orig_cwd = os.getcwd()
+    orig_env = dict(os.environ)
+
+    try:
+        if cwd:
+            os.chdir(cwd)
+
+        if env is not None:
+            os.environ.clear()
+            os.environ.update(env)
+            if hasattr(time, "tzset"):
+                time.tzset()
+
+        yield
+    finally:
+        os.chdir(orig_cwd)
+
+        if env is not None:
+            os.environ.clear()
+            os.environ.update(orig_env)
+            if hasattr(time, "tzset"):
+                time.tzset()
+
+
+def serve(socket_path: str, handler: Handler) -> None:
+    """
+    Serve command executions over a Unix domain socket until interrupted.
+    Requests are processed one by one since a handler redirects the standard streams,
+    and each request is executed in the working directory and the environment of the client.
+    """
+
+    from ._logger import logger  # type: ignore
+
+    class RequestHandler(socketserver.BaseRequestHandler):
+        def handle(self) -> None:
+            try:
+                payload = json.loads(_recv_all(self.request).decode(ENCODING))
+                args = [str(arg) for arg in payload["args"]]
+                cwd = payload.get("cwd")
+                env = payload.get("env")
+                if cwd is not None:
+                    cwd = str(cwd)
+                if env is not None:
+                    env = {str(key): str(value) for key, value in env.items()}
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.error(f"invalid request: {e}")
+                return
+
+            logger.debug(f"request: args={args}, cwd={cwd}")
+            try:
+                with _switch_environment(cwd, env):
+                    exit_code, stdout, stderr = handler(args)
+            except OSError as e:
+                # e.g. the working directory of the client is not accessible
+                exit_code, stdout, stderr = (e.errno or errno.EIO, "", f"{e}\n")
+
+            self.request.sendall(
+                json.dumps({"exit_code": exit_code, "stdout": stdout, "stderr": stderr}).encode(
+                    ENCODING
+                )
+            )
+
+    if os.path.exists(socket_path):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(socket_path)
+        except OSError:
+            # stale socket file of a previous daemon
+            os.remove(socket_path)
+        else:
+            raise OSError(errno.EADDRINUSE, "a daemon is already running", socket_path)
+
+    with socketserver.UnixStreamServer(socket_path, RequestHandler) as server:
+        os.chmod(socket_path, 0o600)
+        logger.info(f"listening on {socket_path}")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
@@ -1,10 +1,16 @@
 from dataclasses import dataclass
-from typing import Any, Dict, Final, List, Optional
+from typing import Any, Dict, Final, List, Optional, Tuple
 
-import pytz
 from datetimerange import DateTimeRange
 from tcolorpy import tcolor
 
+from ._cache import format_datetime, get_timezone, parse_datetime
+
+
+START_TIME_FORMAT: Final[str] = "%Y/%m/%d %H:%M"
+END_TIME_FORMAT: Final[str] = "%H:%M"
+ALL_DAY_START_TIME_FORMAT: Final[str] = "%Y/%m/%d"
+
 
 @dataclass(frozen=True)
 class Object:
@@ -54,28 +60,39 @@ class Event:
         self.dtr: Optional[DateTimeRange] = None
 
         if "start" not in kwargs and self.event_type == "REPEATING":
-            print()
-            print(kwargs["repeatInfo"])
             repeat_info = kwargs["repeatInfo"]
             self.is_all_day: bool = repeat_info["isAllDay"]
-            self.timezone = pytz.timezone(repeat_info["timeZone"])
+            self.timezone = get_timezone(repeat_info["timeZone"])
         else:
+            timezone_name = kwargs["start"]["timeZone"]
             self.is_all_day = kwargs["isAllDay"]
-            self.timezone = pytz.timezone(kwargs["start"]["timeZone"])
+            self.timezone = get_timezone(timezone_name)
             self.dtr = DateTimeRange(
-                start_datetime=kwargs["start"]["dateTime"],
-                end_datetime=kwargs["end"]["dateTime"],
+                start_datetime=parse_datetime(kwargs["start"]["dateTime"], timezone_name),
+                end_datetime=parse_datetime(kwargs["end"]["dateTime"], timezone_name),
                 timezone=self.timezone,
             )
-            self.dtr.start_time_format = "%Y/%m/%d %H:%M"
-            self.dtr.end_time_format = "%H:%M"
+            self.dtr.start_time_format = START_TIME_FORMAT
+            self.dtr.end_time_format = END_TIME_FORMAT
 
-    def as_row(self, is_all_day: bool) -> List:
-        if is_all_day and self.dtr:
-            self.dtr.start_time_format = "%Y/%m/%d"
-            self.dtr.end_time_format = "all day"
+    def as_row(self, is_all_day: bool) -> Tuple[int, str, str]:
+        return (self.id, self.format_datetime_range(is_all_day), self.__make_subject())
 
-        return [self.id, self.dtr, self.__make_subject()]
+    def format_datetime_range(self, is_all_day: bool = False) -> str:
+        if self.dtr is None:
+            return ""
+
+        if is_all_day:
+            return self.dtr.separator.join(
+                [format_datetime(self.dtr.start_datetime, ALL_DAY_START_TIME_FORMAT), "all day"]
+            )
+
+        return self.dtr.separator.join(
+            [
+                format_datetime(self.dtr.start_datetime, START_TIME_FORMAT),
+                format_datetime(self.dtr.end_datetime, END_TIME_FORMAT),
+            ]
+        )
 
     def as_markdown(self) -> str:
         h1_color: Final[str] = "cyan"
@@ -90,7 +107,7 @@ class Event:
             lines.extend(
                 [
                     tcolor("## Date and time", color=h2_color),
-                    str(self.dtr),
+                    self.format_datetime_range(),
                     "",
                 ]
             )
@@ -1,10 +1,12 @@
 from datetime import datetime
-from typing import Any, Final, List, Optional, Union
+from functools import lru_cache
+from typing import Final, Optional, Sequence
 
 from datetimerange import DateTimeRange
-from pytablewriter.style import Cell, Style
 from tcolorpy import Color
 
+from ._table import RowStyleFunc, make_ansi_prefix
+
 
 GRAY: Final[Color] = Color("8f8f8f")
 DARK_GRAY: Final[Color] = Color("#0f0f0f")
@@ -21,55 +23,47 @@ def _calc_other_ground_color(color: Color) -> Color:
     return color
 
 
-def col_separator_style_filter(
-    lcell: Optional[Cell], rcell: Optional[Cell], **kwargs: Any
-) -> Optional[Style]:
-    cell = lcell if lcell else rcell
-    if cell is None:
-        return None
-
-    if cell.is_header_row():
-        return None
+@lru_cache(maxsize=None)
+def _make_row_style(is_ended: bool, is_ongoing: bool, is_ending_today: bool) -> str:
+    fg_color: Optional[Color] = None
+    bg_color: Optional[Color] = None
 
-    dtrs: Final[List[DateTimeRange]] = kwargs["dtrs"]
-    dtr: Final[DateTimeRange] = dtrs[cell.row]
-    now: Final[datetime] = kwargs["now"]
-
-    fg_color: Union[Color, str, None] = None
-    bg_color: Union[Color, str, None] = None
+    if is_ended:
+        fg_color = GRAY
 
-    if now in dtr:
+    if is_ongoing:
         bg_color = DARK_RED
-    elif dtr.end_datetime and dtr.end_datetime.date() == now.date():
+    elif is_ending_today:
         bg_color = DARK_YELLOW
 
-    if fg_color or bg_color:
-        return Style(color=fg_color, bg_color=bg_color)
+    return make_ansi_prefix(color=fg_color, bg_color=bg_color)
 
-    return None
 
+def _is_same_date(value: datetime, now: datetime) -> bool:
+    if value.tzinfo is not None and now.tzinfo is not None:
+        value = value.astimezone(now.tzinfo)
 
-def style_filter(cell: Cell, **kwargs: Any) -> Optional[Style]:
-    if cell.is_header_row():
-        return None
+    return value.date() == now.date()
 
-    dtrs: Final[List[DateTimeRange]] = kwargs["dtrs"]
-    dtr: Final[DateTimeRange] = dtrs[cell.row]
-    now: Final[datetime] = kwargs["now"]
-    ended_event: Final[bool] = True if dtr.end_datetime and dtr.end_datetime < now else False
 
-    fg_color: Union[Color, str, None] = None
-    bg_color: Union[Color, str, None] = None
+def make_event_row_style(dtrs: Sequence[Optional[DateTimeRange]], now: datetime) -> RowStyleFunc:
+    """
+    Make a row style function for an events table:
+    gray out ended events, and highlight ongoing events and events that end today.
+    """
 
-    if ended_event:
-        fg_color = GRAY
+    def row_style(row: int) -> str:
+        dtr = dtrs[row]
+        if dtr is None:
+            return ""
 
-    if now in dtr:
-        bg_color = DARK_RED
-    elif dtr.end_datetime and dtr.end_datetime.date() == now.date():
-        bg_color = DARK_YELLOW
+        start = dtr.start_datetime
+        end = dtr.end_datetime
 
-    if fg_color or bg_color:
-        return Style(color=fg_color, bg_color=bg_color)
+        return _make_row_style(
+            is_ended=end is not None and end < now,
+            is_ongoing=start is not None and end is not None and start <= now <= end,
+            is_ending_today=end is not None and _is_same_date(end, now),
+        )
 
-    return None
+    return row_style
@@ -0,0 +1,262 @@
+import json
+import os
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Final, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .__version__ import __version__
+from ._cache import format_datetime, parse_datetime
+from ._const import MODULE_NAME
+from ._event import Event
+from ._logger import logger  # type: ignore
+
+
+CRLF: Final[str] = "\r\n"
+MAX_LINE_OCTETS: Final[int] = 75
+UTC_DATETIME_FORMAT: Final[str] = "%Y%m%dT%H%M%SZ"
+DATE_FORMAT: Final[str] = "%Y%m%d"
+PRODID: Final[str] = f"-//thombashi//{MODULE_NAME} {__version__}//EN"
+
+# increment when rendered blocks change to invalidate caches of the previous versions
+RENDER_VERSION: Final[int] = 2
+
+# cache key -> (render version and updated_at, rendered VEVENT block)
+RenderCache = Dict[str, Tuple[str, str]]
+
+
+def _fold(line: str) -> str:
+    if len(line.encode("utf8")) <= MAX_LINE_OCTETS:
+        return line
+
+    chunks: List[str] = []
+    chunk = ""
+    size = 0
+
+    for char in line:
+        char_size = len(char.encode("utf8"))
+        if size + char_size > MAX_LINE_OCTETS:
+            chunks.append(chunk)
+            chunk = " "
+            size = 1
+
+        chunk += char
+        size += char_size
+
+    chunks.append(chunk)
+
+    return CRLF.join(chunks)
+
+
+def _escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _quote_param(value: str) -> str:
+    value = value.replace('"', "")
+    if any(char in value for char in ":;,"):
+        return f'"{value}"'
+
+    return value
+
+
+def _format_utc(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), UTC_DATETIME_FORMAT)
+
+
+def _format_timestamp(value: str) -> Optional[str]:
+    if not value:
+        return None
+
+    try:
+        return _format_utc(parse_datetime(value, "UTC"))
+    except ValueError:
+        return None
+
+
+def _make_cache_token(event: Event) -> str:
+    return f"{RENDER_VERSION}/{event.updated_at}"
+
+
+def _make_cache_key(event: Event) -> str:
+    if event.dtr and event.dtr.start_datetime:
+        return f"{event.id}/{event.dtr.start_datetime.isoformat()}"
+
+    return str(event.id)
+
+
+def render_vevent(event: Event) -> Optional[str]:
+    """
+    Render an event as a VEVENT component of RFC 5545.
+
+    Returns:
+        A VEVENT block that ends with CRLF.
+        |None| if the event has no date and time range.
+    """
+
+    if event.dtr is None or event.dtr.start_datetime is None or event.dtr.end_datetime is None:
+        return None
+
+    start = event.dtr.start_datetime
+    end = event.dtr.end_datetime
+    uid = f"{event.id}@{MODULE_NAME}"
+    if event.event_type == "REPEATING":
+        # occurrences of a repeating event share the same id
+        uid = f"{event.id}-{format_datetime(start, DATE_FORMAT)}@{MODULE_NAME}"
+
+    summary = f"{event.event_menu}: {event.subject}" if event.event_menu else event.subject
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{_format_timestamp(event.updated_at) or _format_utc(start)}",
+    ]
+
+    if event.is_all_day:
+        # the end date of DTEND is exclusive: an all-day event ends at 23:59:59 of the last day
+        end_date = end.date()
+        if end.time() != time.min:
+            end_date += timedelta(days=1)
+        end_date = max(end_date, start.date() + timedelta(days=1))
+        lines.extend(
+            [
+                f"DTSTART;VALUE=DATE:{format_datetime(start, DATE_FORMAT)}",
+                f"DTEND;VALUE=DATE:{end_date.strftime(DATE_FORMAT)}",
+            ]
+        )
+    else:
+        lines.extend([f"DTSTART:{_format_utc(start)}", f"DTEND:{_format_utc(end)}"])
+
+    lines.append(f"SUMMARY:{_escape_text(summary)}")
+
+    if event.notes:
+        lines.append(f"DESCRIPTION:{_escape_text(event.notes)}")
+
+    if event.facilities:
+        lines.append(
+            "LOCATION:{}".format(
+                _escape_text(", ".join(facility.name for facility in event.facilities))
+            )
+        )
+
+    for user in event.attendees:
+        lines.append(f"ATTENDEE;CN={_quote_param(user.name)}:urn:{MODULE_NAME}:user:{user.id}")
+
+    created_at = _format_timestamp(event.created_at)
+    if created_at:
+        lines.append(f"CREATED:{created_at}")
+
+    updated_at = _format_timestamp(event.updated_at)
+    if updated_at:
+        lines.append(f"LAST-MODIFIED:{updated_at}")
+
+    lines.append("END:VEVENT")
+
+    return "".join(_fold(line) + CRLF for line in lines)
+
+
+class IcsRenderer:
+    """
+    Render events into an iCalendar feed.
+    Rendered VEVENT blocks are cached and reused while the ``updated_at`` of
+    the events is unchanged.
+
+    Args:
+        cache:
+            Rendered blocks of a previous rendering. See also :py:meth:`load_cache`.
+        calendar_name:
+            Name of the calendar (``X-WR-CALNAME``).
+    """
+
+    def __init__(self, cache: Optional[RenderCache] = None, calendar_name: str = "") -> None:
+        self.__cache: RenderCache = dict(cache) if cache else {}
+        self.__calendar_name = calendar_name
+        self.rendered_count = 0
+        self.reused_count = 0
+
+    @property
+    def cache(self) -> RenderCache:
+        return self.__cache
+
+    def iter_chunks(self, events: Iterable[Event]) -> Iterator[str]:
+        """
+        Iterate chunks of the feed.
+        Cache entries of events that are not in the ``events`` are discarded
+        after the iteration is completed.
+        """
+
+        self.rendered_count = 0
+        self.reused_count = 0
+        cache: RenderCache = {}
+
+        header = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN"]
+        if self.__calendar_name:
+            header.append(f"X-WR-CALNAME:{_escape_text(self.__calendar_name)}")
+        yield "".join(_fold(line) + CRLF for line in header)
+
+        for event in events:
+            key = _make_cache_key(event)
+            token = _make_cache_token(event)
+            cached = self.__cache.get(key)
+
+            if cached is not None and cached[0] == token:
+                block = cached[1]
+                self.reused_count += 1
+            else:
+                rendered = render_vevent(event)
+                if rendered is None:
+                    logger.debug(f"skip an event that has no date and time range: {event.id}")
+                    continue
+
+                block = rendered
+                self.rendered_count += 1
+
+            cache[key] = (token, block)
+            yield block
+
+        yield f"END:VCALENDAR{CRLF}"
+
+        self.__cache = cache
+
+    def write(self, events: Iterable[Event], stream: TextIO) -> None:
+        for chunk in self.iter_chunks(events):
+            stream.write(chunk)
+
+    def load_cache(self, path: str) -> None:
+        """
+        Load rendered blocks from a file written by :py:meth:`dump_cache`.
+        Invalid or nonexistent cache files are ignored.
+        """
+
+        try:
+            with open(path, encoding="utf8") as f:
+                self.__cache = {key: (value[0], value[1]) for key, value in json.load(f).items()}
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError, IndexError, AttributeError) as e:
+            logger.debug(f"ignore an invalid cache file ({path}): {e}")
+
+    def dump_cache(self, path: str) -> None:
+        dir_path = os.path.dirname(path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+
+        with open(path, "w", encoding="utf8") as f:
+            json.dump(self.__cache, f, ensure_ascii=False)
+
+
+def write_ics(
+    events: Iterable[Event], stream: TextIO, renderer: Optional[IcsRenderer] = None
+) -> None:
+    """
+    Write events to the ``stream`` as an iCalendar (RFC 5545) feed.
+    Pass the same ``renderer`` to re-render only the changed events.
+    """
+
+    if renderer is None:
+        renderer = IcsRenderer()
+
+    renderer.write(events, stream)
@@ -0,0 +1,123 @@
+"""
+Entry point of the command.
+A command line is forwarded to a running daemon before importing the dependencies of the tool,
+and executed locally if no daemon is available.
+"""
+
+import errno
+import os
+import re
+import sys
+from typing import Dict, Final, List, Mapping, Optional, Pattern, Sequence, Tuple
+
+from . import _daemon
+from ._const import MODULE_NAME
+
+
+DAEMON_SOCKET_ENV: Final[str] = "GRSCHED_DAEMON_SOCKET"
+PROFILE_ENV: Final[str] = "GRSCHED_PROFILE"
+
+# global options that take a value
+VALUE_OPTIONS: Final[Tuple[str, ...]] = ("--daemon-socket", "--profile")
+# global options that do not change where a command line is executed
+FLAG_OPTIONS: Final[Tuple[str, ...]] = ("--debug", "-q", "--quiet", "--all-profiles")
+VERBOSE_OPTION_PATTERN: Final[Pattern] = re.compile(r"^(-v+|--verbose)$")
+
+
+def _parse_global_options(args: Sequence[str]) -> Optional[Tuple[int, Dict[str, str]]]:
+    """
+    Returns:
+        A tuple of the index of the subcommand and the global options that are given.
+        |None| if the global options include options that the launcher does not handle.
+    """
+
+    options: Dict[str, str] = {}
+    idx = 0
+
+    while idx < len(args) and args[idx].startswith("-"):
+        arg = args[idx]
+        name, separator, value = arg.partition("=")
+
+        if name in VALUE_OPTIONS:
+            if not separator:
+                idx += 1
+                if idx >= len(args):
+                    return None
+                value = args[idx]
+
+            options[name] = value
+        elif arg in FLAG_OPTIONS or VERBOSE_OPTION_PATTERN.search(arg):
+            options[arg] = ""
+        else:
+            return None
+
+        idx += 1
+
+    return (idx, options)
+
+
+def find_forwarding(
+    args: Sequence[str], environ: Mapping[str, str]
+) -> Optional[Tuple[str, List[str]]]:
+    """
+    Determine whether a command line is forwarded to a daemon.
+
+    Returns:
+        A tuple of the socket path of the daemon and the arguments to forward.
+        The profile specified by the environment variable is included in the arguments,
+        since the daemon resolves the options with its own environment variables.
+        |None| if the command line should be executed locally:
+        Unix domain sockets are not available, no daemon socket is specified,
+        the command is not forwardable,
+        or the global options include options that the launcher does not handle
+        (e.g. ``--offline``, ``--snapshot``, ``--help``).
+    """
+
+    if not _daemon.is_available():
+        return None
+
+    parsed = _parse_global_options(args)
+    if parsed is None:
+        return None
+
+    idx, options = parsed
+    if idx >= len(args) or args[idx] in _daemon.NON_FORWARDABLE_COMMANDS:
+        return None
+
+    socket_path = options.get("--daemon-socket", environ.get(DAEMON_SOCKET_ENV))
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+
+    profile = environ.get(PROFILE_ENV)
+    if profile and "--profile" not in options and "--all-profiles" not in options:
+        return (socket_path, ["--profile", profile] + list(args))
+
+    return (socket_path, list(args))
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    forwarding = find_forwarding(args, os.environ)
+
+    if forwarding is not None:
+        socket_path, forward_args = forwarding
+
+        try:
+            exit_code, stdout, stderr = _daemon.request(
+                socket_path, forward_args, cwd=os.getcwd(), env=os.environ
+            )
+        except _daemon.DaemonUnavailableError:
+            # fallback to local execution if the daemon is not reachable
+            pass
+        except OSError as e:
+            # the daemon may have executed the command line: do not execute it again
+            sys.stderr.write(f"{MODULE_NAME}: failed to communicate with the daemon: {e}\n")
+            sys.exit(errno.EIO)
+        else:
+            sys.stdout.write(stdout)
+            sys.stderr.write(stderr)
+            sys.exit(exit_code)
+
+    from .__main__ import cmd
+
+    cmd(args=args)
@@ -0,0 +1,289 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Final,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from dateutil import tz
+
+from ._cache import parse_datetime
+from ._client import ClientProtocol
+from ._const import MAX_WORKERS
+from ._event import Event, Organization, User
+from ._logger import logger  # type: ignore
+
+
+T = TypeVar("T")
+C = TypeVar("C")
+
+NEXT_EVENT_SEARCH_FIELDS: Final[List[str]] = ["id", "eventType", "isAllDay", "start"]
+
+
+def _iter_pages(fetch: Callable[[int], Tuple[List[T], bool]]) -> Iterator[T]:
+    offset = 0
+    has_next = True
+
+    while has_next:
+        items, has_next = fetch(offset)
+        if not items:
+            break
+
+        yield from items
+
+        offset += len(items)
+
+
+def _iter_pages_parallel(
+    fetch: Callable[[int], Tuple[List[T], bool]], max_workers: int
+) -> Iterator[T]:
+    if max_workers <= 1:
+        yield from _iter_pages(fetch)
+        return
+
+    # the first page determines the page size of the following offsets
+    items, has_next = fetch(0)
+    yield from items
+
+    if not has_next or not items:
+        return
+
+    page_size = len(items)
+    next_page = 1
+    futures: Deque["Future[Tuple[List[T], bool]]"] = deque()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for _ in range(max_workers):
+                futures.append(executor.submit(fetch, next_page * page_size))
+                next_page += 1
+
+            while futures:
+                items, has_next = futures.popleft().result()
+                yield from items
+
+                if not has_next or len(items) < page_size:
+                    break
+
+                futures.append(executor.submit(fetch, next_page * page_size))
+                next_page += 1
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def iter_events(
+    client: ClientProtocol,
+    start: Optional[datetime] = None,
+    days: float = 7,
+    target: Optional[str] = None,
+    target_type: Optional[str] = None,
+) -> Iterator[Event]:
+    """
+    Iterate events of a target in the range that starts from ``start`` and lasts ``days``.
+    Following pages are fetched while iterating.
+
+    Args:
+        client:
+            A client to fetch events: e.g. :py:class:`GaroonClient` or :py:class:`SnapshotClient`.
+        start:
+            Start datetime of the range. Defaults to the beginning of today.
+        days:
+            Number of days of the range.
+        target:
+            User/organization id of the target. Defaults to the login user.
+        target_type:
+            Type of the ``target``: ``"user"`` or ``"organization"``.
+
+    Raises:
+        requests.HTTPError:
+            If a request failed.
+    """
+
+    if start is None:
+        start = datetime.now(tz=tz.tzlocal()).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    return _iter_pages(
+        lambda offset: client.fetch_events(
+            start=start, days=days, target=target, target_type=target_type, offset=offset
+        )
+    )
+
+
+def iter_users(client: ClientProtocol, max_workers: int = MAX_WORKERS) -> Iterator[User]:
+    """
+    Iterate all of the users.
+    Pages after the first one are fetched in parallel by ``max_workers`` threads,
+    so the client must be thread-safe (e.g. ``GaroonClient``, ``CachedGaroonClient``).
+
+    Raises:
+        requests.HTTPError:
+            If a request failed.
+    """
+
+    return _iter_pages_parallel(client.fetch_users, max_workers)
+
+
+def iter_organizations(
+    client: ClientProtocol, max_workers: int = MAX_WORKERS
+) -> Iterator[Organization]:
+    """
+    Iterate all of the organizations.
+    Pages after the first one are fetched in parallel by ``max_workers`` threads,
+    so the client must be thread-safe (e.g. ``GaroonClient``, ``CachedGaroonClient``).
+
+    Raises:
+        requests.HTTPError:
+            If a request failed.
+    """
+
+    return _iter_pages_parallel(client.fetch_organizations, max_workers)
+
+
+def query_profiles(
+    clients: Mapping[str, C],
+    query: Callable[[C], Iterable[T]],
+    max_workers: int = MAX_WORKERS,
+) -> Dict[str, List[T]]:
+    """
+    Execute a query with each of the clients concurrently.
+    Each client is expected to be connected to a different tenant (profile).
+
+    Args:
+        clients:
+            Clients to execute the query with, keyed by the profile names.
+        query:
+            A function that executes the query with a client.
+        max_workers:
+            Maximum number of profiles to be queried at the same time.
+
+    Returns:
+        Results of the query keyed by the profile names, in the order of the ``clients``.
+
+    Raises:
+        requests.HTTPError:
+            If a request failed.
+    """
+
+    if len(clients) <= 1 or max_workers <= 1:
+        return {profile: list(query(client)) for profile, client in clients.items()}
+
+    futures: Dict[str, "Future[List[T]]"] = {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(clients))) as executor:
+        try:
+            for profile, client in clients.items():
+                futures[profile] = executor.submit(lambda client: list(query(client)), client)
+
+            return {profile: future.result() for profile, future in futures.items()}
+        finally:
+            for future in futures.values():
+                future.cancel()
+
+
+def _find_next_record(
+    client: ClientProtocol,
+    now: datetime,
+    start: datetime,
+    end: datetime,
+    target: Optional[str],
+    target_type: Optional[str],
+) -> Optional[Tuple[Dict[str, Any], datetime]]:
+    days = (end - start) / timedelta(days=1)
+    records = _iter_pages(
+        lambda offset: client.fetch_event_records(
+            start=start,
+            days=days,
+            target=target,
+            target_type=target_type,
+            offset=offset,
+            fields=NEXT_EVENT_SEARCH_FIELDS,
+        )
+    )
+
+    for record in records:
+        if record.get("isAllDay"):
+            continue
+
+        if "start" not in record:
+            logger.debug(f"start of a event is not found: {record}")
+            continue
+
+        event_start = parse_datetime(record["start"]["dateTime"], record["start"]["timeZone"])
+        if now < event_start:
+            return (record, event_start)
+
+    return None
+
+
+def find_next_event(
+    client: ClientProtocol,
+    now: Optional[datetime] = None,
+    days: float = 14,
+    target: Optional[str] = None,
+    target_type: Optional[str] = None,
+    initial_window: timedelta = timedelta(hours=4),
+) -> Optional[Event]:
+    """
+    Find the first event that starts after ``now`` within ``days``.
+    All-day events are excluded.
+
+    The search starts with ``initial_window`` and doubles the window while no events are found.
+    Only the minimal fields of events are fetched during the search,
+    and then the details of the found event are fetched.
+
+    Returns:
+        The next event. |None| if not found.
+
+    Raises:
+        requests.HTTPError:
+            If a request failed.
+    """
+
+    if now is None:
+        now = datetime.now(tz=tz.tzlocal())
+
+    limit = now + timedelta(days=days)
+    window_start = now
+    window = initial_window
+    found = None
+
+    while window_start < limit:
+        window_end = min(now + window, limit)
+        logger.debug(f"search the next event: {window_start} - {window_end}")
+
+        found = _find_next_record(client, now, window_start, window_end, target, target_type)
+        if found is not None:
+            break
+
+        window_start = window_end
+        window *= 2
+    else:
+        return None
+
+    record, event_start = found
+    event_id = int(record["id"])
+
+    if record.get("eventType") == "REGULAR":
+        return client.fetch_event(event_id)
+
+    # fetch the occurrence since occurrences of a repeating event share the same id
+    events, _has_next = client.fetch_events(
+        start=event_start, days=1 / (24 * 60), target=target, target_type=target_type
+    )
+    for event in events:
+        if event.id == event_id and event.dtr and event.dtr.start_datetime == event_start:
+            return event
+
+    return client.fetch_event(event_id)
@@ -0,0 +1,286 @@
+import json
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Final, List, Optional, Sequence, Tuple
+
+from ._cache import parse_datetime
+from ._const import MODULE_NAME
+from ._event import Event, Organization, User
+from ._logger import logger  # type: ignore
+
+
+MAGIC: Final[bytes] = b"GRSCHED-SNAPSHOT-1\n"
+INDEX_SIZE_FORMAT: Final[str] = "<Q"
+ENCODING: Final[str] = "utf8"
+COMPRESSION_LEVEL: Final[int] = 6
+
+
+class SnapshotError(Exception):
+    """
+    Exception raised when a snapshot is invalid or does not contain the requested data.
+    """
+
+
+def get_default_snapshot_path(profile: Optional[str] = None) -> str:
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    filename = f"snapshot-{profile}.bin" if profile else "snapshot.bin"
+
+    return os.path.join(cache_dir, MODULE_NAME, filename)
+
+
+def _get_range(record: Dict[str, Any]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    if "start" not in record:
+        return (None, None)
+
+    start = parse_datetime(record["start"]["dateTime"], record["start"]["timeZone"])
+    if "end" not in record:
+        return (start, None)
+
+    return (start, parse_datetime(record["end"]["dateTime"], record["end"]["timeZone"]))
+
+
+class SnapshotWriter:
+    """
+    Write fetched data to a snapshot file.
+
+    A snapshot file consists of the magic bytes, the size of the index, a JSON index,
+    and zlib compressed JSON blocks. The index holds the offset/size of each block,
+    and the date range and the target of each events block.
+    """
+
+    def __init__(self) -> None:
+        self.__blocks: List[bytes] = []
+        self.__offset = 0
+        self.__index: Dict[str, Any] = {"events": [], "users": None, "organizations": None}
+
+    def add_events(
+        self,
+        records: Sequence[Dict[str, Any]],
+        start: datetime,
+        end: datetime,
+        target: Optional[str] = None,
+        target_type: Optional[str] = None,
+    ) -> None:
+        entry = self.__add_block(records)
+        entry.update(
+            {
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "target": target,
+                "target_type": target_type,
+            }
+        )
+        self.__index["events"].append(entry)
+
+    def add_users(self, users: Sequence[User]) -> None:
+        self.__index["users"] = self.__add_block([asdict(user) for user in users])
+
+    def add_organizations(self, organizations: Sequence[Organization]) -> None:
+        self.__index["organizations"] = self.__add_block([asdict(org) for org in organizations])
+
+    def write(self, path: str) -> None:
+        dir_path = os.path.dirname(path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+
+        index = json.dumps(self.__index).encode(ENCODING)
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack(INDEX_SIZE_FORMAT, len(index)))
+            f.write(index)
+
+            for block in self.__blocks:
+                f.write(block)
+
+        os.replace(tmp_path, path)
+        logger.debug(f"snapshot written: path={path}, blocks={len(self.__blocks)}")
+
+    def __add_block(self, records: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        block = zlib.compress(
+            json.dumps(records, ensure_ascii=False).encode(ENCODING), COMPRESSION_LEVEL
+        )
+        entry = {"offset": self.__offset, "size": len(block), "count": len(records)}
+
+        self.__blocks.append(block)
+        self.__offset += len(block)
+
+        return entry
+
+
+class SnapshotClient:
+    """
+    A client that answers queries from a snapshot file instead of a Garoon server.
+    The snapshot file is memory-mapped and blocks are decompressed on demand.
+
+    Raises:
+        SnapshotError:
+            If the snapshot file is not accessible or broken.
+            Broken blocks are detected when the blocks are loaded by queries.
+    """
+
+    def __init__(self, path: str) -> None:
+        try:
+            with open(path, "rb") as f:
+                self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"failed to open a snapshot: {e}")
+
+        try:
+            self.__index, self.__data_pos = self.__load_index(path)
+        except SnapshotError:
+            self.__mmap.close()
+            raise
+
+        self.__path = path
+        self.__blocks: Dict[int, List[Dict[str, Any]]] = {}
+
+        logger.debug(f"snapshot loaded: path={path}")
+
+    def __enter__(self) -> "SnapshotClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the memory-mapped snapshot file.
+        Queries of blocks that are not loaded yet raise |SnapshotError| after closed.
+        """
+
+        self.__mmap.close()
+
+    def fetch_event(self, id: int) -> Event:
+        for entry in self.__index["events"]:
+            for record in self.__load_block(entry):
+                if int(record["id"]) == id:
+                    return Event(**record)
+
+        raise SnapshotError(f"event not found in the snapshot: id={id}")
+
+    def fetch_events(
+        self,
+        start: Optional[datetime],
+        days: float,
+        target: Optional[str] = None,
+        target_type: Optional[str] = None,
+        offset: int = 0,
+    ) -> Tuple[List[Event], bool]:
+        records, has_next = self.fetch_event_records(
+            start=start, days=days, target=target, target_type=target_type, offset=offset
+        )
+
+        return ([Event(**record) for record in records], has_next)
+
+    def fetch_event_records(
+        self,
+        start: Optional[datetime],
+        days: float,
+        target: Optional[str] = None,
+        target_type: Optional[str] = None,
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        entries = [
+            entry
+            for entry in self.__index["events"]
+            if entry["target"] == target and entry["target_type"] == target_type
+        ]
+        if not entries:
+            raise SnapshotError(
+                f"events of the target not found in the snapshot: target={target}, "
+                f"target_type={target_type}"
+            )
+
+        range_start = start
+        range_end = start + timedelta(days=days) if start else None
+
+        if range_start and range_end:
+            covered = any(
+                datetime.fromisoformat(entry["start"]) <= range_start
+                and range_end <= datetime.fromisoformat(entry["end"])
+                for entry in entries
+            )
+            if not covered:
+                logger.warning("the snapshot does not cover the whole of the requested range")
+
+        # occurrences of a repeating event share the same id
+        records: Dict[Tuple[str, float], Dict[str, Any]] = {}
+        for entry in entries:
+            for record in self.__load_block(entry):
+                event_start, event_end = _get_range(record)
+                key = (str(record["id"]), event_start.timestamp() if event_start else float("-inf"))
+                if key in records:
+                    continue
+
+                if range_start and range_end:
+                    if event_start and event_start >= range_end:
+                        continue
+                    if event_end and event_end < range_start:
+                        continue
+
+                records[key] = record
+
+        sorted_records = [records[key] for key in sorted(records, key=lambda key: key[1])]
+        if fields:
+            sorted_records = [
+                {field: record[field] for field in fields if field in record}
+                for record in sorted_records
+            ]
+
+        return (sorted_records[offset:], False)
+
+    def fetch_users(self, offset: int) -> Tuple[List[User], bool]:
+        return ([User(**record) for record in self.__load_block_of("users")[offset:]], False)
+
+    def fetch_organizations(self, offset: int) -> Tuple[List[Organization], bool]:
+        return (
+            [Organization(**record) for record in self.__load_block_of("organizations")[offset:]],
+            False,
+        )
+
+    def __load_index(self, path: str) -> Tuple[Dict[str, Any], int]:
+        if self.__mmap[: len(MAGIC)] != MAGIC:
+            raise SnapshotError(f"not a {MODULE_NAME} snapshot: {path}")
+
+        index_pos = len(MAGIC) + struct.calcsize(INDEX_SIZE_FORMAT)
+
+        try:
+            (index_size,) = struct.unpack(INDEX_SIZE_FORMAT, self.__mmap[len(MAGIC) : index_pos])
+            index = json.loads(self.__mmap[index_pos : index_pos + index_size].decode(ENCODING))
+        except (struct.error, ValueError) as e:
+            raise SnapshotError(f"broken snapshot index: {path}: {e}")
+
+        if not isinstance(index, dict) or not isinstance(index.get("events"), list):
+            raise SnapshotError(f"broken snapshot index: {path}")
+
+        return (index, index_pos + index_size)
+
+    def __load_block_of(self, name: str) -> List[Dict[str, Any]]:
+        entry = self.__index.get(name)
+        if entry is None:
+            raise SnapshotError(f"{name} not found in the snapshot")
+
+        return self.__load_block(entry)
+
+    def __load_block(self, entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        try:
+            offset = entry["offset"]
+            if offset not in self.__blocks:
+                if self.__mmap.closed:
+                    raise SnapshotError(f"the snapshot is closed: {self.__path}")
+
+                pos = self.__data_pos + offset
+                self.__blocks[offset] = json.loads(
+                    zlib.decompress(self.__mmap[pos : pos + entry["size"]]).decode(ENCODING)
+                )
+        except (zlib.error, ValueError, KeyError, TypeError) as e:
+            raise SnapshotError(f"broken snapshot block: {self.__path}: {e}")
+
+        return self.__blocks[offset]
@@ -0,0 +1,205 @@
+from datetime import tzinfo
+from typing import Final, Iterable, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from ._event import Event
+
+
+SECONDS_PER_HOUR: Final[int] = 60 * 60
+HOURS_PER_WEEK: Final[int] = 7 * 24
+WEEKDAYS: Final[List[str]] = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+class EventFrames(NamedTuple):
+    # one row per event: id, start, end (epoch seconds), attendees (number of attendees)
+    events: pd.DataFrame
+
+    # one row per attendee of an event: event (row index of events), user_id, user_name
+    attendances: pd.DataFrame
+
+    # one row per facility of an event: event (row index of events), facility_id, facility_name
+    reservations: pd.DataFrame
+
+
+def to_frames(events: Iterable[Event]) -> EventFrames:
+    """
+    Convert events into columnar data frames.
+    All-day events and events that have no date and time range are excluded.
+    """
+
+    ids: List[int] = []
+    starts: List[float] = []
+    ends: List[float] = []
+    attendee_counts: List[int] = []
+    attendance_events: List[int] = []
+    user_ids: List[str] = []
+    user_names: List[str] = []
+    reservation_events: List[int] = []
+    facility_ids: List[str] = []
+    facility_names: List[str] = []
+
+    for event in events:
+        if event.is_all_day or event.dtr is None:
+            continue
+
+        start = event.dtr.start_datetime
+        end = event.dtr.end_datetime
+        if start is None or end is None:
+            continue
+
+        row = len(ids)
+        ids.append(event.id)
+        starts.append(start.timestamp())
+        ends.append(end.timestamp())
+        attendee_counts.append(len(event.attendees))
+
+        for user in event.attendees:
+            attendance_events.append(row)
+            user_ids.append(str(user.id))
+            user_names.append(user.name)
+
+        for facility in event.facilities:
+            reservation_events.append(row)
+            facility_ids.append(str(facility.id))
+            facility_names.append(facility.name)
+
+    return EventFrames(
+        events=pd.DataFrame(
+            {
+                "id": np.asarray(ids, dtype=np.int64),
+                "start": np.asarray(starts, dtype=np.int64),
+                "end": np.asarray(ends, dtype=np.int64),
+                "attendees": np.asarray(attendee_counts, dtype=np.int64),
+            }
+        ),
+        attendances=pd.DataFrame(
+            {
+                "event": np.asarray(attendance_events, dtype=np.int64),
+                "user_id": user_ids,
+                "user_name": user_names,
+            }
+        ),
+        reservations=pd.DataFrame(
+            {
+                "event": np.asarray(reservation_events, dtype=np.int64),
+                "facility_id": facility_ids,
+                "facility_name": facility_names,
+            }
+        ),
+    )
+
+
+def _calc_hours(events: pd.DataFrame) -> np.ndarray:
+    return (events["end"].to_numpy() - events["start"].to_numpy()) / SECONDS_PER_HOUR
+
+
+def _to_local_datetimes(epochs: np.ndarray, timezone: tzinfo) -> pd.DatetimeIndex:
+    return pd.to_datetime(epochs, unit="s", utc=True).tz_convert(timezone)
+
+
+def calc_weekly_meeting_hours(frames: EventFrames, timezone: tzinfo) -> pd.DataFrame:
+    """
+    Hours in meetings per user per week.
+    Weeks are represented by the date of the Monday.
+    """
+
+    attendances = frames.attendances
+    event_rows = attendances["event"].to_numpy()
+    local_starts = _to_local_datetimes(frames.events["start"].to_numpy()[event_rows], timezone)
+    weeks = (local_starts - pd.to_timedelta(local_starts.weekday, unit="D")).strftime("%Y-%m-%d")
+
+    table = pd.DataFrame(
+        {
+            "week": weeks,
+            "user_id": attendances["user_id"].to_numpy(),
+            "user_name": attendances["user_name"].to_numpy(),
+            "hours": _calc_hours(frames.events)[event_rows],
+        }
+    )
+
+    return (
+        table.groupby(["week", "user_id", "user_name"], sort=True)["hours"]
+        .agg(["sum", "count"])
+        .rename(columns={"sum": "hours", "count": "events"})
+        .reset_index()
+    )
+
+
+def calc_busy_slots(frames: EventFrames, timezone: tzinfo, top: int = 10) -> pd.DataFrame:
+    """
+    Number of events that occupy each one-hour slot of a week, busiest first.
+    """
+
+    events = frames.events
+    if events.empty:
+        return pd.DataFrame(columns=["weekday", "hour", "events"])
+
+    local_starts = _to_local_datetimes(events["start"].to_numpy(), timezone)
+    first_slots = local_starts.weekday.to_numpy() * 24 + local_starts.hour.to_numpy()
+    slot_starts = events["start"].to_numpy() - (
+        local_starts.minute.to_numpy() * 60 + local_starts.second.to_numpy()
+    )
+
+    # number of one-hour slots that each event overlaps
+    num_slots = np.ceil((events["end"].to_numpy() - slot_starts) / SECONDS_PER_HOUR)
+    num_slots = np.clip(num_slots, 1, HOURS_PER_WEEK).astype(np.int64)
+
+    offsets = np.arange(num_slots.sum()) - np.repeat(np.cumsum(num_slots) - num_slots, num_slots)
+    slots = (np.repeat(first_slots, num_slots) + offsets) % HOURS_PER_WEEK
+    counts = np.bincount(slots, minlength=HOURS_PER_WEEK)
+
+    busiest = np.argsort(-counts, kind="stable")[:top]
+    busiest = busiest[counts[busiest] > 0]
+
+    return pd.DataFrame(
+        {
+            "weekday": np.asarray(WEEKDAYS)[busiest // 24],
+            "hour": [f"{hour:02d}:00" for hour in busiest % 24],
+            "events": counts[busiest],
+        }
+    )
+
+
+def calc_facility_utilization(frames: EventFrames, period_hours: float) -> pd.DataFrame:
+    """
+    Reserved hours per facility and the ratio of the hours to the period.
+    """
+
+    reservations = frames.reservations
+    event_rows = reservations["event"].to_numpy()
+    table = pd.DataFrame(
+        {
+            "facility_id": reservations["facility_id"].to_numpy(),
+            "facility_name": reservations["facility_name"].to_numpy(),
+            "hours": _calc_hours(frames.events)[event_rows],
+        }
+    )
+    result = (
+        table.groupby(["facility_id", "facility_name"])["hours"]
+        .agg(["sum", "count"])
+        .rename(columns={"sum": "hours", "count": "events"})
+        .reset_index()
+    )
+    result["utilization"] = (result["hours"] / period_hours).round(4) if period_hours > 0 else 0.0
+
+    return result.sort_values("hours", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def calc_attendee_counts(frames: EventFrames, bins: List[int]) -> pd.DataFrame:
+    """
+    Histogram of the number of attendees per event.
+    ``bins`` are the lower bounds of each bin.
+    """
+
+    counts = frames.events["attendees"].to_numpy()
+    edges = np.asarray(bins + [max(bins[-1], int(counts.max(initial=0))) + 1])
+    histogram, _ = np.histogram(counts, bins=edges)
+
+    labels = [
+        f"{lower}" if upper - lower == 1 else f"{lower}-{upper - 1}"
+        for lower, upper in zip(edges[:-2], edges[1:-1])
+    ] + [f"{edges[-2]}+"]
+
+    return pd.DataFrame({"attendees": labels, "events": histogram})
@@ -0,0 +1,221 @@
+import re
+import sys
+import unicodedata
+from typing import Any, Callable, Final, List, Optional, Pattern, Sequence, TextIO, Tuple, Union
+
+from tcolorpy import Color, tcolor
+
+
+ANSI_RESET: Final[str] = "\x1b[0m"
+WRITE_CHUNK_ROWS: Final[int] = 1024
+MARKDOWN_MIN_WIDTH: Final[int] = 3
+NUMBER_PATTERN: Final[Pattern] = re.compile(r"^[-+]?(\d+\.?\d*|\.\d+)$")
+
+ColorValue = Union[Color, str, None]
+
+# (row index) -> ANSI escape sequence to be applied to the row
+RowStyleFunc = Callable[[int], str]
+
+
+class TableFormat:
+    MARKDOWN: Final[str] = "markdown"
+    SPACE_ALIGNED: Final[str] = "space_aligned"
+
+
+def make_ansi_prefix(color: ColorValue = None, bg_color: ColorValue = None) -> str:
+    if color is None and bg_color is None:
+        return ""
+
+    sentinel = "\0"
+    styled = tcolor(sentinel, color=color, bg_color=bg_color)
+
+    return styled[: styled.index(sentinel)]
+
+
+ALTROW_STYLES: Final[Tuple[str, str]] = (
+    make_ansi_prefix(color="black", bg_color="white"),
+    make_ansi_prefix(color="white", bg_color="black"),
+)
+
+
+def altrow_style(row: int) -> str:
+    return ALTROW_STYLES[row % 2]
+
+
+def _calc_width(text: str) -> int:
+    if text.isascii():
+        return len(text)
+
+    return sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in text)
+
+
+def _to_str(value: Any) -> str:
+    if value is None:
+        return ""
+
+    text = str(value)
+    if "\n" in text:
+        # line breaks in a cell break the table
+        text = text.replace("\r\n", " ").replace("\n", " ")
+
+    return text
+
+
+def _escape_markdown(text: str) -> str:
+    if "|" not in text:
+        return text
+
+    return text.replace("|", "\\|")
+
+
+def _is_number(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+
+    if isinstance(value, (int, float)):
+        return True
+
+    return isinstance(value, str) and NUMBER_PATTERN.match(value) is not None
+
+
+def _align(text: str, width: int, text_width: int, align: str) -> str:
+    padding = width - text_width
+    if padding <= 0:
+        return text
+
+    if align == "right":
+        return " " * padding + text
+    if align == "center":
+        left = padding // 2
+        return " " * left + text + " " * (padding - left)
+
+    return text + " " * padding
+
+
+def write_table(
+    headers: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    table_format: str = TableFormat.MARKDOWN,
+    margin: int = 0,
+    row_style: Optional[RowStyleFunc] = None,
+    stream: Optional[TextIO] = None,
+) -> None:
+    """
+    Write a table with less overhead than pytablewriter for large tables.
+    Numbers are right-aligned, and the others are left-aligned.
+
+    Args:
+        headers:
+            Headers of the table.
+        rows:
+            Rows of the table.
+        table_format:
+            ``"markdown"`` or ``"space_aligned"``.
+        margin:
+            Number of spaces around each cell of a markdown table.
+        row_style:
+            A function that returns an ANSI escape sequence to be applied to a row.
+        stream:
+            Output stream. Defaults to the standard output.
+    """
+
+    if stream is None:
+        stream = sys.stdout
+
+    if table_format == TableFormat.MARKDOWN:
+        headers = [_escape_markdown(header) for header in headers]
+
+    num_cols = len(headers)
+    min_width = MARKDOWN_MIN_WIDTH if table_format == TableFormat.MARKDOWN else 0
+
+    # first pass: stringify cells and calculate the widths and the alignments of the columns
+    str_rows: List[List[str]] = []
+    cell_widths: List[List[int]] = []
+    widths = [max(_calc_width(header), min_width) for header in headers]
+    is_numbers = [True] * num_cols
+    has_values = [False] * num_cols
+
+    cell_aligns: List[List[str]] = []
+
+    for row in rows:
+        str_row = [_to_str(value) for value in row]
+        if table_format == TableFormat.MARKDOWN:
+            str_row = [_escape_markdown(text) for text in str_row]
+        row_widths = [_calc_width(text) for text in str_row]
+        row_aligns = ["left"] * num_cols
+
+        for col, (value, text_width) in enumerate(zip(row, row_widths)):
+            if text_width > widths[col]:
+                widths[col] = text_width
+
+            if value is None or value == "":
+                continue
+
+            has_values[col] = True
+            if _is_number(value):
+                row_aligns[col] = "right"
+            else:
+                is_numbers[col] = False
+
+        str_rows.append(str_row)
+        cell_widths.append(row_widths)
+        cell_aligns.append(row_aligns)
+
+    aligns = [
+        "right" if is_number and has_value else "left"
+        for is_number, has_value in zip(is_numbers, has_values)
+    ]
+
+    if table_format == TableFormat.MARKDOWN:
+        pad = " " * margin
+        line_start = f"|{pad}"
+        col_separator = f"{pad}|{pad}"
+        line_end = f"{pad}|"
+    else:
+        line_start = ""
+        col_separator = "  "
+        line_end = ""
+
+    def make_line(cells: Sequence[str]) -> str:
+        return line_start + col_separator.join(cells) + line_end
+
+    # second pass: write lines
+    lines = [
+        make_line(
+            [
+                _align(header, width, _calc_width(header), "center")
+                for header, width in zip(headers, widths)
+            ]
+        )
+        + "\n"
+    ]
+    if table_format == TableFormat.MARKDOWN:
+        lines.append(
+            make_line(
+                [
+                    "-" * (width - 1) + ":" if align == "right" else "-" * width
+                    for width, align in zip(widths, aligns)
+                ]
+            )
+            + "\n"
+        )
+
+    for row_idx, (str_row, row_widths, row_aligns) in enumerate(
+        zip(str_rows, cell_widths, cell_aligns)
+    ):
+        line = make_line(
+            [
+                _align(text, width, text_width, align)
+                for text, text_width, width, align in zip(str_row, row_widths, widths, row_aligns)
+            ]
+        )
+
+        style = row_style(row_idx) if row_style else ""
+        lines.append(f"{style}{line}{ANSI_RESET}\n" if style else f"{line}\n")
+
+        if len(lines) >= WRITE_CHUNK_ROWS:
+            stream.write("".join(lines))
+            lines.clear()
+
+    if lines:
+        stream.write("".join(lines))
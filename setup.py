@@ -52,7 +52,11 @@ setuptools.setup(
     },
     python_requires=">=3.8",
     install_requires=INSTALL_REQUIRES,
-    extras_require={"test": TESTS_REQUIRES},
+    extras_require={
+        "stats": ["numpy>=1.20", "pandas>=1.2"],
+        "stream": ["Brotli>=1.0.9", "ijson>=3.1,<4"],
+        "test": TESTS_REQUIRES,
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Environment :: Console",
@@ -73,7 +77,7 @@ setuptools.setup(
     zip_safe=False,
     entry_points={
         "console_scripts": [
-            "grsched=grsched.__main__:cmd",
+            "grsched=grsched._launcher:main",
         ]
     },
 )
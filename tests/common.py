@@ -1,3 +1,6 @@
+from grsched import Event
+
+
 def print_result(stdout, stderr, expected=None):
     if expected:
         print(f"[expected]\n{expected}")
@@ -7,3 +10,33 @@ def print_result(stdout, stderr, expected=None):
 
     if stderr:
         print(f"[stderr]\n{stderr}")
+
+
+def make_event_record(
+    id, start, end, is_all_day=False, updated_at="2023-01-01T00:00:00Z", **kwargs
+):
+    user = {"id": "1", "name": "user", "code": "user"}
+
+    params = dict(
+        id=id,
+        creator=user,
+        createdAt="2023-01-01T00:00:00Z",
+        updater=user,
+        updatedAt=updated_at,
+        eventType="REGULAR",
+        eventMenu="",
+        subject=f"subject {id}",
+        notes="",
+        isAllDay=is_all_day,
+        isStartOnly=False,
+        attendees=[dict(type="USER", **user)],
+        start={"dateTime": start, "timeZone": "Asia/Tokyo"},
+        end={"dateTime": end, "timeZone": "Asia/Tokyo"},
+    )
+    params.update(kwargs)
+
+    return params
+
+
+def make_event(*args, **kwargs):
+    return Event(**make_event_record(*args, **kwargs))
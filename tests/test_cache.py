@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pytest
+from datetimerange import DateTimeRange
+
+from grsched import _cache
+from grsched._filter import make_event_row_style
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    _cache.clear()
+    yield
+    _cache.clear()
+
+
+class Test_parse_datetime:
+    def test_normal(self):
+        value = _cache.parse_datetime("2023-01-10T09:00:00+09:00", "Asia/Tokyo")
+
+        assert value.isoformat() == "2023-01-10T09:00:00+09:00"
+        assert _cache.parse_datetime("2023-01-10T09:00:00+09:00", "Asia/Tokyo") is value
+
+    def test_exception(self):
+        with pytest.raises(ValueError):
+            _cache.parse_datetime("invalid", "UTC")
+
+
+class Test_format_datetime:
+    def test_normal_timezones(self):
+        # the same instant in different timezones
+        jst = _cache.parse_datetime("2023-01-10T09:00:00+09:00", "Asia/Tokyo")
+        utc = _cache.parse_datetime("2023-01-10T00:00:00Z", "UTC")
+        assert jst == utc
+
+        for _ in range(2):
+            assert _cache.format_datetime(jst, "%Y/%m/%d %H:%M %Z") == "2023/01/10 09:00 JST"
+            assert _cache.format_datetime(utc, "%Y/%m/%d %H:%M %Z") == "2023/01/10 00:00 UTC"
+            assert _cache.format_datetime(jst, "%z") == "+0900"
+            assert _cache.format_datetime(utc, "%z") == "+0000"
+
+    def test_normal_naive(self):
+        assert _cache.format_datetime(datetime(2023, 1, 10, 9), "%H:%M%z") == "09:00"
+
+    def test_normal_none(self):
+        assert _cache.format_datetime(None, "%H:%M") == "NaT"
+
+
+class Test_make_event_row_style:
+    def test_normal_timezones(self):
+        # 2023-01-10 23:30 in UTC is 2023-01-11 08:30 in JST
+        now = _cache.parse_datetime("2023-01-10T23:30:00Z", "UTC")
+        jst_dtr = DateTimeRange("2023-01-11T07:00:00+09:00", "2023-01-11T08:00:00+09:00")
+        utc_dtr = DateTimeRange("2023-01-10T22:00:00Z", "2023-01-10T23:00:00Z")
+        assert jst_dtr.end_datetime == utc_dtr.end_datetime
+
+        row_style = make_event_row_style([jst_dtr, utc_dtr], now=now)
+
+        # both of the events ended today in the timezone of now
+        assert row_style(0) == row_style(1)
+        assert row_style(0) != make_event_row_style([None], now=now)(0)
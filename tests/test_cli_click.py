@@ -1,6 +1,10 @@
+import errno
+
 import pytest
 from click.testing import CliRunner
 
+from grsched import SnapshotWriter, User
+from grsched import __main__ as cli
 from grsched.__main__ import cmd
 
 
@@ -12,6 +16,10 @@ class Test_help:
             [["events", "-h"], 0],
             [["show", "-h"], 0],
             [["users", "-h"], 0],
+            [["daemon", "-h"], 0],
+            [["stats", "-h"], 0],
+            [["snapshot", "save", "-h"], 0],
+            [["ics", "-h"], 0],
         ],
     )
     def test_help(self, options, expected):
@@ -26,3 +34,32 @@ class Test_version_subcmd:
         result = runner.invoke(cmd, ["version"])
         assert result.exit_code == 0
         assert len(result.stdout) > 30
+
+
+class Test_context:
+    def test_normal_snapshot(self, tmp_path, monkeypatch):
+        def make_garoon_client(profile):
+            raise ValueError("require a valid subdomain")
+
+        monkeypatch.setattr(cli, "_make_garoon_client", make_garoon_client)
+
+        snapshot_path = str(tmp_path / "snapshot.bin")
+        writer = SnapshotWriter()
+        writer.add_users([User(1, "snapshot-user", "code")])
+        writer.write(snapshot_path)
+
+        runner = CliRunner()
+        result = runner.invoke(cmd, ["--snapshot", snapshot_path, "users"])
+        assert result.exit_code == 0
+        assert "snapshot-user" in result.stdout
+
+        # the snapshot client of the previous invocation should not be reused
+        result = runner.invoke(cmd, ["users"])
+        assert result.exit_code == 1
+        assert "snapshot-user" not in result.stdout
+
+    @pytest.mark.parametrize("command", ["configure", "daemon", "snapshot", "version"])
+    def test_exception_in_daemon(self, command):
+        runner = CliRunner()
+        result = runner.invoke(cmd, [command], obj={cli.Context.IN_DAEMON: True}, input="\n" * 10)
+        assert result.exit_code == errno.EPERM
@@ -0,0 +1,145 @@
+import gzip
+import io
+import json
+import sys
+import time
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+from urllib3 import HTTPResponse
+
+from grsched import CachedGaroonClient, GaroonClient, Organization, User, _client, iter_users
+
+from .common import make_event_record
+
+
+class FakeSession:
+    def __init__(self, data):
+        self.data = data
+
+    def get(self, url, headers, params, stream):
+        body = gzip.compress(json.dumps(self.data, ensure_ascii=False).encode("utf8"))
+        headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = "utf8"
+        response.raw = HTTPResponse(
+            body=io.BytesIO(body), headers=headers, status=200, preload_content=False
+        )
+
+        return response
+
+
+def make_client(data):
+    client = GaroonClient(subdomain="example", basic_auth="")
+    client._GaroonClient__session = FakeSession(data)
+
+    return client
+
+
+@pytest.fixture(params=["ijson", "json"])
+def parser(request, monkeypatch):
+    if request.param == "ijson":
+        if _client.ijson is None:
+            pytest.skip("ijson is not installed")
+    else:
+        monkeypatch.setattr(_client, "ijson", None)
+
+    return request.param
+
+
+class Test_GaroonClient_fetch_items:
+    def test_normal_organizations(self, parser):
+        orgs = [
+            Organization(
+                "1", "name1", "code1", [{"id": "2", "name": "name2", "code": "code2"}], ""
+            ),
+            Organization("2", "名前2", "code2", [], "1"),
+        ]
+        client = make_client(
+            {
+                "organizations": [
+                    {
+                        "id": org.id,
+                        "name": org.name,
+                        "code": org.code,
+                        "childOrganizations": org.childOrganizations,
+                        "parentOrganization": org.parentOrganization,
+                    }
+                    for org in orgs
+                ],
+                "hasNext": True,
+            }
+        )
+
+        assert client.fetch_organizations(0) == (orgs, True)
+
+    def test_normal_event_records(self, parser):
+        records = [
+            make_event_record(
+                1, "2023-01-10T09:00:00+09:00", "2023-01-10T10:00:00+09:00", subject="a"
+            ),
+            make_event_record(
+                2, "2023-01-10T11:00:00+09:00", "2023-01-10T12:30:00+09:00", subject="b"
+            ),
+        ]
+        records[1]["additionalItems"] = {"item": {"value": "x"}}
+        client = make_client({"hasNext": False, "events": records})
+
+        assert client.fetch_event_records(start=None, days=1) == (records, False)
+
+    def test_normal_empty(self, parser):
+        client = make_client({"users": [], "hasNext": False})
+
+        assert client.fetch_users(0) == ([], False)
+
+
+class Test_CachedGaroonClient:
+    def test_normal(self, monkeypatch):
+        now = [1000.0]
+        fetched_offsets = []
+
+        def fetch_users(self, offset):
+            fetched_offsets.append(offset)
+            return ([User(offset, f"name{offset}", "")], False)
+
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(GaroonClient, "fetch_users", fetch_users)
+        client = CachedGaroonClient(subdomain="example", basic_auth="", ttl=60)
+
+        assert client.fetch_users(0) == client.fetch_users(0)
+        assert fetched_offsets == [0]
+
+        now[0] += 30
+        client.fetch_users(1)
+        assert client.cache_size == 2
+
+        # expired entries are purged when another entry is inserted
+        now[0] += 40
+        client.fetch_users(2)
+        assert client.cache_size == 2
+
+        now[0] += 100
+        client.fetch_users(0)
+        assert client.cache_size == 1
+        assert fetched_offsets == [0, 1, 2, 0]
+
+    def test_normal_threads(self, monkeypatch):
+        def fetch_users(self, offset):
+            return ([User(offset, f"name{offset}", "")], offset < 200)
+
+        monkeypatch.setattr(GaroonClient, "fetch_users", fetch_users)
+        # expire entries immediately to purge the cache on every fetch
+        client = CachedGaroonClient(subdomain="example", basic_auth="", ttl=0)
+
+        orig_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for _ in range(30):
+                users = list(iter_users(client, max_workers=4))
+                assert [user.id for user in users] == list(range(201))
+        finally:
+            sys.setswitchinterval(orig_interval)
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+from appconfigpy import ConfigManager
+
+from grsched import _config
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    monkeypatch.setattr(
+        _config, "app_config_mgr", ConfigManager(_config.MODULE_NAME, _config.CONFIG_ITEMS)
+    )
+
+    return tmp_path
+
+
+def write_config(path, configs):
+    path.write_text(json.dumps(configs))
+
+
+class Test_list_profiles:
+    def test_normal(self, home):
+        write_config(home / ".grsched", {"subdomain": "default", "basic_auth": "xxx"})
+        write_config(home / ".grsched.acme", {"subdomain": "acme", "basic_auth": "xxx"})
+        write_config(home / ".grsched.group-company", {"subdomain": "group"})
+        # files that are not profiles
+        write_config(home / ".grsched.old", {"subdomain": ""})
+        (home / ".grsched.bak").write_text("{broken")
+        (home / ".grsched.sock").write_text("")
+        (home / ".grsched.json~").write_text("{}")
+        (home / ".grsched.d").mkdir()
+
+        assert _config.list_profiles() == ["default", "acme", "group-company"]
+
+    def test_normal_no_default(self, home):
+        write_config(home / ".grsched.acme", {"subdomain": "acme"})
+
+        assert _config.list_profiles() == ["acme"]
+
+    def test_normal_empty(self, home):
+        assert _config.list_profiles() == []
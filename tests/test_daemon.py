@@ -0,0 +1,183 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+from grsched import _daemon, _launcher
+from grsched._launcher import find_forwarding
+
+
+requires_unix_socket = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets are not available"
+)
+
+
+@pytest.fixture
+def short_tmp_path():
+    # the length of a Unix domain socket path is limited (e.g. 104 bytes on macOS)
+    path = tempfile.mkdtemp(prefix="grsched")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@requires_unix_socket
+class Test_find_forwarding:
+    @pytest.fixture
+    def socket_path(self, tmp_path):
+        path = tmp_path / "grsched.sock"
+        path.touch()
+
+        return str(path)
+
+    @pytest.mark.parametrize(
+        ["args", "expected"],
+        [
+            [["events"], True],
+            [["-vv", "--debug", "events", "--days", "3"], True],
+            [["--profile", "acme", "users"], True],
+            [["--profile=acme", "users"], True],
+            [["--offline", "events"], False],
+            [["--snapshot", "snapshot.bin", "events"], False],
+            [["--help"], False],
+            [["--unknown", "events"], False],
+            [["configure"], False],
+            [["daemon"], False],
+            [["snapshot", "save"], False],
+            [[], False],
+        ],
+    )
+    def test_normal(self, socket_path, args, expected):
+        environ = {"GRSCHED_DAEMON_SOCKET": socket_path}
+
+        if expected:
+            assert find_forwarding(args, environ) == (socket_path, args)
+        else:
+            assert find_forwarding(args, environ) is None
+
+    def test_normal_option(self, socket_path):
+        args = ["--daemon-socket", socket_path, "events"]
+
+        assert find_forwarding(args, {}) == (socket_path, args)
+
+    def test_normal_profile_env(self, socket_path):
+        environ = {"GRSCHED_DAEMON_SOCKET": socket_path, "GRSCHED_PROFILE": "acme"}
+
+        assert find_forwarding(["events"], environ) == (
+            socket_path,
+            ["--profile", "acme", "events"],
+        )
+        # options take precedence over the environment variable
+        assert find_forwarding(["--profile=other", "events"], environ) == (
+            socket_path,
+            ["--profile=other", "events"],
+        )
+        assert find_forwarding(["--all-profiles", "events"], environ) == (
+            socket_path,
+            ["--all-profiles", "events"],
+        )
+
+    def test_normal_no_unix_socket(self, socket_path, monkeypatch):
+        monkeypatch.delattr(socket, "AF_UNIX")
+
+        assert find_forwarding(["events"], {"GRSCHED_DAEMON_SOCKET": socket_path}) is None
+
+    def test_normal_no_daemon(self, tmp_path):
+        assert find_forwarding(["events"], {}) is None
+        assert (
+            find_forwarding(["events"], {"GRSCHED_DAEMON_SOCKET": str(tmp_path / "not-exist")})
+            is None
+        )
+
+
+@requires_unix_socket
+class Test_main:
+    @pytest.fixture
+    def local_args(self, tmp_path, monkeypatch):
+        import grsched.__main__
+
+        socket_path = tmp_path / "grsched.sock"
+        socket_path.touch()
+        local_args = []
+
+        monkeypatch.setattr("sys.argv", ["grsched", "events"])
+        monkeypatch.setenv("GRSCHED_DAEMON_SOCKET", str(socket_path))
+        monkeypatch.setattr(grsched.__main__, "cmd", lambda args: local_args.append(args))
+
+        return local_args
+
+    def test_normal_fallback(self, local_args, monkeypatch):
+        def request(*args, **kwargs):
+            raise _daemon.DaemonUnavailableError()
+
+        monkeypatch.setattr(_daemon, "request", request)
+        _launcher.main()
+
+        assert local_args == [["events"]]
+
+    def test_exception_communication(self, local_args, monkeypatch):
+        def request(*args, **kwargs):
+            raise TimeoutError()
+
+        monkeypatch.setattr(_daemon, "request", request)
+        with pytest.raises(SystemExit) as e:
+            _launcher.main()
+
+        # the command line is not executed again locally
+        assert e.value.code != 0
+        assert local_args == []
+
+
+def start_daemon(socket_path, handler):
+    thread = threading.Thread(target=_daemon.serve, args=(socket_path, handler), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(socket_path):
+            break
+        time.sleep(0.01)
+
+
+@requires_unix_socket
+class Test_request:
+    def test_normal(self, tmp_path, short_tmp_path):
+        socket_path = os.path.join(short_tmp_path, "grsched.sock")
+        work_dir = tmp_path / "work"
+        work_dir.mkdir()
+
+        def handler(args):
+            return (3, f"{args} {os.getcwd()}", os.environ.get("GRSCHED_TEST_VALUE", ""))
+
+        start_daemon(socket_path, handler)
+
+        orig_cwd = os.getcwd()
+        exit_code, stdout, stderr = _daemon.request(
+            socket_path,
+            ["events"],
+            cwd=str(work_dir),
+            env={**os.environ, "GRSCHED_TEST_VALUE": "acme"},
+        )
+
+        assert exit_code == 3
+        assert stdout == f"['events'] {work_dir}"
+        assert stderr == "acme"
+        assert os.getcwd() == orig_cwd
+        assert "GRSCHED_TEST_VALUE" not in os.environ
+
+    def test_normal_slow(self, short_tmp_path):
+        socket_path = os.path.join(short_tmp_path, "grsched.sock")
+
+        def handler(args):
+            time.sleep(0.5)
+            return (0, "done", "")
+
+        start_daemon(socket_path, handler)
+
+        # the connect timeout does not apply to the execution of a command line
+        assert _daemon.request(socket_path, ["stats"], connect_timeout=0.1) == (0, "done", "")
+
+    def test_exception_unavailable(self, short_tmp_path):
+        with pytest.raises(_daemon.DaemonUnavailableError):
+            _daemon.request(os.path.join(short_tmp_path, "not-exist.sock"), ["events"])
@@ -0,0 +1,100 @@
+import io
+
+import pytest
+
+from grsched import IcsRenderer, render_vevent
+
+from .common import make_event
+
+
+class Test_render_vevent:
+    def test_normal(self):
+        event = make_event(
+            1,
+            "2023-01-10T09:00:00+09:00",
+            "2023-01-10T10:00:00+09:00",
+            facilities=[{"id": "1", "name": "Room A", "code": "a"}],
+        )
+
+        assert render_vevent(event).split("\r\n") == [
+            "BEGIN:VEVENT",
+            "UID:1@grsched",
+            "DTSTAMP:20230101T000000Z",
+            "DTSTART:20230110T000000Z",
+            "DTEND:20230110T010000Z",
+            "SUMMARY:subject 1",
+            "LOCATION:Room A",
+            "ATTENDEE;CN=user:urn:grsched:user:1",
+            "CREATED:20230101T000000Z",
+            "LAST-MODIFIED:20230101T000000Z",
+            "END:VEVENT",
+            "",
+        ]
+
+    def test_all_day(self):
+        event = make_event(
+            1, "2023-01-10T00:00:00+09:00", "2023-01-10T23:59:59+09:00", is_all_day=True
+        )
+        lines = render_vevent(event).split("\r\n")
+
+        assert "DTSTART;VALUE=DATE:20230110" in lines
+        assert "DTEND;VALUE=DATE:20230111" in lines
+
+    @pytest.mark.parametrize(
+        ["start", "end", "expected"],
+        [
+            ["2023-01-10T00:00:00+09:00", "2023-01-12T23:59:59+09:00", "20230113"],
+            ["2023-01-10T00:00:00+09:00", "2023-01-12T00:00:00+09:00", "20230112"],
+            ["2023-01-10T00:00:00+09:00", "2023-01-10T00:00:00+09:00", "20230111"],
+            ["2023-12-30T00:00:00+09:00", "2024-01-02T23:59:59+09:00", "20240103"],
+        ],
+    )
+    def test_all_day_multiple_days(self, start, end, expected):
+        event = make_event(1, start, end, is_all_day=True)
+        lines = render_vevent(event).split("\r\n")
+
+        assert f"DTSTART;VALUE=DATE:{start[:10].replace('-', '')}" in lines
+        assert f"DTEND;VALUE=DATE:{expected}" in lines
+
+    def test_fold(self):
+        event = make_event(
+            1, "2023-01-10T09:00:00+09:00", "2023-01-10T10:00:00+09:00", notes="あ" * 100
+        )
+
+        for line in render_vevent(event).split("\r\n"):
+            assert len(line.encode("utf8")) <= 75
+
+
+class Test_IcsRenderer:
+    def test_incremental(self):
+        events = [
+            make_event(1, "2023-01-10T09:00:00+09:00", "2023-01-10T10:00:00+09:00"),
+            make_event(2, "2023-01-10T11:00:00+09:00", "2023-01-10T12:00:00+09:00"),
+        ]
+        renderer = IcsRenderer()
+        renderer.write(events, io.StringIO())
+        assert (renderer.rendered_count, renderer.reused_count) == (2, 0)
+
+        events[1] = make_event(
+            2,
+            "2023-01-10T11:00:00+09:00",
+            "2023-01-10T12:00:00+09:00",
+            updated_at="2023-01-02T00:00:00Z",
+        )
+        output = io.StringIO()
+        renderer.write(events, output)
+        assert (renderer.rendered_count, renderer.reused_count) == (1, 1)
+        assert output.getvalue().startswith("BEGIN:VCALENDAR\r\n")
+        assert output.getvalue().endswith("END:VCALENDAR\r\n")
+
+    def test_invalidate_previous_version(self):
+        event = make_event(
+            1, "2023-01-10T00:00:00+09:00", "2023-01-12T23:59:59+09:00", is_all_day=True
+        )
+        # a cache entry rendered by a previous version
+        renderer = IcsRenderer(cache={"1/2023-01-10T00:00:00+09:00": (event.updated_at, "")})
+        output = io.StringIO()
+        renderer.write([event], output)
+
+        assert (renderer.rendered_count, renderer.reused_count) == (1, 0)
+        assert "DTEND;VALUE=DATE:20230113\r\n" in output.getvalue()
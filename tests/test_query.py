@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+import pytest
+from dateutil import tz
+from requests.exceptions import HTTPError
+
+from grsched import (
+    Event,
+    Organization,
+    User,
+    find_next_event,
+    iter_organizations,
+    iter_users,
+    query_profiles,
+)
+
+from .common import make_event_record
+
+
+class PagedClient:
+    def __init__(self, users, records, page_size):
+        self.users = users
+        self.records = records
+        self.page_size = page_size
+        self.fetched_ids = []
+
+    def fetch_users(self, offset):
+        return self.__page(self.users, offset)
+
+    def fetch_event(self, id):
+        self.fetched_ids.append(id)
+        return Event(**next(record for record in self.records if record["id"] == id))
+
+    def fetch_events(self, start, days, target=None, target_type=None, offset=0):
+        records, has_next = self.fetch_event_records(start, days, offset=offset)
+        return ([Event(**record) for record in records], has_next)
+
+    def fetch_event_records(
+        self, start, days, target=None, target_type=None, offset=0, fields=None
+    ):
+        end = start + timedelta(days=days)
+        records = [
+            record
+            for record in self.records
+            if start <= datetime.fromisoformat(record["start"]["dateTime"]) < end
+        ]
+        return self.__page(records, offset)
+
+    def __page(self, items, offset):
+        end = offset + self.page_size
+        return (items[offset:end], end < len(items))
+
+
+class Test_iter_users:
+    def test_normal(self):
+        users = [User(i, f"name{i}", f"code{i}") for i in range(7)]
+        client = PagedClient(users=users, records=[], page_size=3)
+
+        assert list(iter_users(client)) == users
+
+
+class Test_find_next_event:
+    def test_normal(self):
+        records = [
+            make_event_record(1, "2023-01-10T00:00:00+09:00", "2023-01-10T23:59:59+09:00", True),
+            make_event_record(2, "2023-01-10T09:00:00+09:00", "2023-01-10T10:00:00+09:00"),
+            make_event_record(3, "2023-01-12T11:00:00+09:00", "2023-01-12T12:00:00+09:00"),
+            make_event_record(4, "2023-01-12T13:00:00+09:00", "2023-01-12T14:00:00+09:00"),
+        ]
+        client = PagedClient(users=[], records=records, page_size=1)
+        now = datetime(2023, 1, 10, 8, 0, tzinfo=tz.gettz("Asia/Tokyo"))
+
+        assert find_next_event(client, now=now).id == 2
+
+        now = datetime(2023, 1, 10, 10, 0, tzinfo=tz.gettz("Asia/Tokyo"))
+
+        assert find_next_event(client, now=now).id == 3
+        assert client.fetched_ids == [2, 3]
+
+    def test_not_found(self):
+        client = PagedClient(users=[], records=[], page_size=1)
+
+        assert find_next_event(client) is None
+
+
+class Test_iter_organizations:
+    def test_normal(self):
+        orgs = [Organization(i, f"name{i}", f"code{i}", [], "") for i in range(23)]
+
+        class OrgClient:
+            def fetch_organizations(self, offset):
+                end = offset + 5
+                return (orgs[offset:end], end < len(orgs))
+
+        for max_workers in [1, 2, 8]:
+            assert list(iter_organizations(OrgClient(), max_workers=max_workers)) == orgs
+
+
+class Test_query_profiles:
+    def test_normal(self):
+        clients = {
+            f"profile{i}": PagedClient(
+                users=[User(j, f"name{i}-{j}", "") for j in range(i + 1)], records=[], page_size=2
+            )
+            for i in range(5)
+        }
+
+        for max_workers in [1, 2, 8]:
+            results = query_profiles(clients, iter_users, max_workers=max_workers)
+
+            assert list(results) == list(clients)
+            for profile, users in results.items():
+                assert users == clients[profile].users
+
+    def test_exception(self):
+        class FailedClient:
+            def fetch_users(self, offset):
+                raise HTTPError("401 Client Error")
+
+        clients = {
+            "ok": PagedClient(users=[User(1, "name", "")], records=[], page_size=1),
+            "ng": FailedClient(),
+        }
+
+        with pytest.raises(HTTPError):
+            query_profiles(clients, iter_users)
@@ -0,0 +1,178 @@
+import mmap
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from grsched import Organization, SnapshotClient, SnapshotError, SnapshotWriter, User
+
+from .common import make_event_record
+
+
+START = datetime.fromisoformat("2023-01-09T00:00:00+09:00")
+
+
+def make_record(id, start, hours=1, **kwargs):
+    start_datetime = datetime.fromisoformat(start)
+    end_datetime = start_datetime + timedelta(hours=hours)
+
+    return make_event_record(id, start_datetime.isoformat(), end_datetime.isoformat(), **kwargs)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    writer = SnapshotWriter()
+    writer.add_events(
+        [
+            make_record(1, "2023-01-09T09:00:00+09:00"),
+            # occurrences of a repeating event share the same id
+            make_record(2, "2023-01-10T10:00:00+09:00", eventType="REPEATING"),
+            make_record(2, "2023-01-11T10:00:00+09:00", eventType="REPEATING"),
+            make_record(2, "2023-01-12T10:00:00+09:00", eventType="REPEATING"),
+            make_record(3, "2023-01-13T18:00:00+09:00"),
+        ],
+        start=START,
+        end=START + timedelta(days=7),
+    )
+    writer.add_events(
+        [
+            make_record(10, "2023-01-10T13:00:00+09:00"),
+            # duplicated event with the default target block
+            make_record(1, "2023-01-09T09:00:00+09:00"),
+        ],
+        start=START,
+        end=START + timedelta(days=7),
+        target="100",
+        target_type="user",
+    )
+    writer.add_users([User(1, "user1", "code1"), User(2, "ユーザー2", "code2")])
+    writer.add_organizations([Organization(1, "org1", "code1", [], "")])
+
+    path = str(tmp_path / "snapshot" / "snapshot.bin")
+    writer.write(path)
+
+    return path
+
+
+class Test_SnapshotClient:
+    def test_normal(self, snapshot_path):
+        with SnapshotClient(snapshot_path) as client:
+            events, has_next = client.fetch_events(start=START, days=7)
+
+            assert not has_next
+            assert [(event.id, event.dtr.start_datetime.day) for event in events] == [
+                (1, 9),
+                (2, 10),
+                (2, 11),
+                (2, 12),
+                (3, 13),
+            ]
+
+    def test_normal_range(self, snapshot_path):
+        with SnapshotClient(snapshot_path) as client:
+            events, _ = client.fetch_events(start=START + timedelta(days=1, hours=12), days=1)
+
+            assert [(event.id, event.dtr.start_datetime.day) for event in events] == [(2, 11)]
+
+    def test_normal_target(self, snapshot_path):
+        with SnapshotClient(snapshot_path) as client:
+            events, _ = client.fetch_events(start=START, days=7, target="100", target_type="user")
+
+            assert [event.id for event in events] == [1, 10]
+
+            with pytest.raises(SnapshotError):
+                client.fetch_events(start=START, days=7, target="999", target_type="user")
+
+    def test_normal_records(self, snapshot_path):
+        with SnapshotClient(snapshot_path) as client:
+            records, _ = client.fetch_event_records(
+                start=START, days=7, offset=3, fields=["id", "eventType"]
+            )
+
+            assert records == [
+                {"id": 2, "eventType": "REPEATING"},
+                {"id": 3, "eventType": "REGULAR"},
+            ]
+
+    def test_normal_event(self, snapshot_path):
+        with SnapshotClient(snapshot_path) as client:
+            assert client.fetch_event(3).subject == "subject 3"
+
+            with pytest.raises(SnapshotError):
+                client.fetch_event(999)
+
+    def test_normal_users_organizations(self, snapshot_path):
+        with SnapshotClient(snapshot_path) as client:
+            assert client.fetch_users(0) == (
+                [User(1, "user1", "code1"), User(2, "ユーザー2", "code2")],
+                False,
+            )
+            assert client.fetch_users(1) == ([User(2, "ユーザー2", "code2")], False)
+            assert client.fetch_organizations(0) == (
+                [Organization(1, "org1", "code1", [], "")],
+                False,
+            )
+
+    def test_exception_not_found(self, tmp_path):
+        with pytest.raises(SnapshotError):
+            SnapshotClient(str(tmp_path / "not-exist.bin"))
+
+    def test_exception_no_users(self, tmp_path):
+        path = str(tmp_path / "snapshot.bin")
+        SnapshotWriter().write(path)
+        with SnapshotClient(path) as client:
+            with pytest.raises(SnapshotError):
+                client.fetch_users(0)
+
+    def test_normal_close(self, snapshot_path):
+        with SnapshotClient(snapshot_path) as client:
+            client.fetch_users(0)
+
+        # loaded blocks are still available
+        assert len(client.fetch_users(0)[0]) == 2
+
+        with pytest.raises(SnapshotError):
+            client.fetch_organizations(0)
+
+    def test_exception_not_snapshot(self, tmp_path, monkeypatch):
+        mmaps = []
+        orig_mmap = mmap.mmap
+
+        def spy_mmap(*args, **kwargs):
+            mmaps.append(orig_mmap(*args, **kwargs))
+            return mmaps[-1]
+
+        monkeypatch.setattr(mmap, "mmap", spy_mmap)
+        path = tmp_path / "snapshot.bin"
+        path.write_bytes(b"not a snapshot file")
+
+        with pytest.raises(SnapshotError):
+            SnapshotClient(str(path))
+
+        # the file is not kept mapped
+        assert [mapped.closed for mapped in mmaps] == [True]
+
+    def test_exception_truncated(self, snapshot_path, tmp_path):
+        with open(snapshot_path, "rb") as f:
+            data = f.read()
+
+        path = str(tmp_path / "truncated.bin")
+        for size in range(0, len(data), 7):
+            with open(path, "wb") as f:
+                f.write(data[:size])
+
+            with pytest.raises(SnapshotError):
+                with SnapshotClient(path) as client:
+                    client.fetch_events(start=START, days=7)
+                    client.fetch_events(start=START, days=7, target="100", target_type="user")
+                    client.fetch_users(0)
+                    client.fetch_organizations(0)
+
+    def test_exception_broken_block(self, snapshot_path):
+        with open(snapshot_path, "r+b") as f:
+            f.seek(-16, os.SEEK_END)
+            f.write(b"\0" * 16)
+
+        with SnapshotClient(snapshot_path) as client:
+            with pytest.raises(SnapshotError):
+                client.fetch_organizations(0)
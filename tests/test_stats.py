@@ -0,0 +1,171 @@
+import pytest
+from dateutil import tz
+
+
+pytest.importorskip("pandas")
+
+from grsched import _stats  # noqa: E402
+
+from .common import make_event  # noqa: E402
+
+
+TIMEZONE = tz.gettz("Asia/Tokyo")
+
+
+def make_user(id):
+    return {"type": "USER", "id": id, "name": f"name{id}", "code": f"code{id}"}
+
+
+def make_facility(id):
+    return {"id": id, "name": f"room{id}", "code": f"code{id}"}
+
+
+@pytest.fixture
+def frames():
+    events = [
+        # Mon 09:30 - 11:00
+        make_event(
+            1,
+            "2023-01-09T09:30:00+09:00",
+            "2023-01-09T11:00:00+09:00",
+            attendees=[make_user("1"), make_user("2")],
+            facilities=[make_facility("1")],
+        ),
+        # Mon 10:00 - 10:30
+        make_event(
+            2,
+            "2023-01-09T10:00:00+09:00",
+            "2023-01-09T10:30:00+09:00",
+            attendees=[make_user("1")],
+        ),
+        # Sun 23:00 - Mon 01:00 of the next week
+        make_event(
+            3,
+            "2023-01-15T23:00:00+09:00",
+            "2023-01-16T01:00:00+09:00",
+            attendees=[make_user("1")],
+            facilities=[make_facility("1")],
+        ),
+        # all-day events are excluded
+        make_event(
+            4,
+            "2023-01-10T00:00:00+09:00",
+            "2023-01-10T23:59:59+09:00",
+            is_all_day=True,
+            attendees=[make_user("2")],
+        ),
+        # Tue 09:00 - 10:00 of the next week
+        make_event(
+            5,
+            "2023-01-17T09:00:00+09:00",
+            "2023-01-17T10:00:00+09:00",
+            attendees=[],
+            facilities=[make_facility("2")],
+        ),
+    ]
+
+    return _stats.to_frames(events)
+
+
+@pytest.fixture
+def empty_frames():
+    return _stats.to_frames(
+        [
+            make_event(1, "2023-01-09T09:00:00+09:00", "2023-01-09T10:00:00+09:00", attendees=[]),
+        ]
+    )
+
+
+class Test_to_frames:
+    def test_normal(self, frames):
+        assert frames.events["id"].tolist() == [1, 2, 3, 5]
+        assert frames.events["attendees"].tolist() == [2, 1, 1, 0]
+        assert frames.attendances["event"].tolist() == [0, 0, 1, 2]
+        assert frames.reservations["event"].tolist() == [0, 2, 3]
+
+
+class Test_calc_weekly_meeting_hours:
+    def test_normal(self, frames):
+        result = _stats.calc_weekly_meeting_hours(frames, TIMEZONE)
+
+        assert result.to_dict("records") == [
+            {"week": "2023-01-09", "user_id": "1", "user_name": "name1", "hours": 4.0, "events": 3},
+            {"week": "2023-01-09", "user_id": "2", "user_name": "name2", "hours": 1.5, "events": 1},
+        ]
+
+    def test_normal_week_boundary(self, frames):
+        # the Sunday event belongs to the next week in UTC+14
+        result = _stats.calc_weekly_meeting_hours(frames, tz.gettz("Pacific/Kiritimati"))
+
+        assert result[["week", "user_id", "hours"]].values.tolist() == [
+            ["2023-01-09", "1", 2.0],
+            ["2023-01-09", "2", 1.5],
+            ["2023-01-16", "1", 2.0],
+        ]
+
+    def test_normal_empty(self, empty_frames):
+        assert _stats.calc_weekly_meeting_hours(empty_frames, TIMEZONE).empty
+
+
+class Test_calc_busy_slots:
+    def test_normal(self, frames):
+        result = _stats.calc_busy_slots(frames, TIMEZONE)
+
+        assert result.values.tolist() == [
+            ["Mon", "10:00", 2],
+            ["Mon", "00:00", 1],
+            ["Mon", "09:00", 1],
+            ["Tue", "09:00", 1],
+            ["Sun", "23:00", 1],
+        ]
+
+    def test_normal_top(self, frames):
+        assert _stats.calc_busy_slots(frames, TIMEZONE, top=2).values.tolist() == [
+            ["Mon", "10:00", 2],
+            ["Mon", "00:00", 1],
+        ]
+
+    def test_normal_empty(self):
+        assert _stats.calc_busy_slots(_stats.to_frames([]), TIMEZONE).empty
+
+
+class Test_calc_facility_utilization:
+    def test_normal(self, frames):
+        result = _stats.calc_facility_utilization(frames, period_hours=168)
+
+        assert result.to_dict("records") == [
+            {
+                "facility_id": "1",
+                "facility_name": "room1",
+                "hours": 3.5,
+                "events": 2,
+                "utilization": 0.0208,
+            },
+            {
+                "facility_id": "2",
+                "facility_name": "room2",
+                "hours": 1.0,
+                "events": 1,
+                "utilization": 0.006,
+            },
+        ]
+
+    def test_normal_empty(self, empty_frames):
+        assert _stats.calc_facility_utilization(empty_frames, period_hours=168).empty
+
+
+class Test_calc_attendee_counts:
+    def test_normal(self, frames):
+        result = _stats.calc_attendee_counts(frames, bins=[0, 1, 2, 3])
+
+        assert result.values.tolist() == [["0", 1], ["1", 2], ["2", 1], ["3+", 0]]
+
+    def test_normal_ranges(self, frames):
+        result = _stats.calc_attendee_counts(frames, bins=[0, 2])
+
+        assert result.values.tolist() == [["0-1", 3], ["2+", 1]]
+
+    def test_normal_empty(self):
+        result = _stats.calc_attendee_counts(_stats.to_frames([]), bins=[0, 1])
+
+        assert result.values.tolist() == [["0", 0], ["1+", 0]]
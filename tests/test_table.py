@@ -0,0 +1,61 @@
+import io
+
+import pytest
+
+from grsched._table import ANSI_RESET, TableFormat, altrow_style, write_table
+
+
+class Test_write_table:
+    def test_normal_markdown(self):
+        out = io.StringIO()
+        write_table(["id", "name"], [(1, "alice"), (100, "日本語")], margin=1, stream=out)
+
+        assert out.getvalue() == "\n".join(
+            [
+                "| id  |  name  |",
+                "| --: | ------ |",
+                "|   1 | alice  |",
+                "| 100 | 日本語 |",
+                "",
+            ]
+        )
+
+    def test_normal_markdown_escape(self):
+        out = io.StringIO()
+        write_table(["a|b", "text"], [(1, "x | y"), (2, "line1\nline2")], stream=out)
+
+        assert out.getvalue() == "\n".join(
+            [
+                "|a\\|b|   text    |",
+                "|---:|-----------|",
+                "|   1|x \\| y     |",
+                "|   2|line1 line2|",
+                "",
+            ]
+        )
+
+    def test_normal_space_aligned(self):
+        out = io.StringIO()
+        write_table(
+            ["id", "name"],
+            [(1, "alice"), (100, None)],
+            table_format=TableFormat.SPACE_ALIGNED,
+            stream=out,
+        )
+
+        assert out.getvalue() == "\n".join(["id   name ", "  1  alice", "100       ", ""])
+
+    def test_normal_row_style(self):
+        out = io.StringIO()
+        write_table(["id"], [(1,), (2,)], row_style=altrow_style, stream=out)
+        lines = out.getvalue().splitlines()
+
+        assert lines[2] == f"{altrow_style(0)}|  1|{ANSI_RESET}"
+        assert lines[3] == f"{altrow_style(1)}|  2|{ANSI_RESET}"
+
+    @pytest.mark.parametrize(["num_rows"], [[0], [1], [3000]])
+    def test_normal_num_rows(self, num_rows):
+        out = io.StringIO()
+        write_table(["id"], [(i,) for i in range(num_rows)], stream=out)
+
+        assert len(out.getvalue().splitlines()) == num_rows + 2